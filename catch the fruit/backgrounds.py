@@ -0,0 +1,103 @@
+import pygame
+
+# -------------------------
+# Gradient definitions
+# -------------------------
+# Each screen state has a vertical gradient from a top colour to a bottom colour.
+GRADIENTS = {
+    "menu": ((8, 6, 20), (28, 20, 40)),
+    "playing": ((6, 8, 20), (18, 18, 36)),
+    "gameover": ((4, 6, 10), (16, 12, 28)),
+}
+
+
+def gradient_color(top, bottom, y, height):
+    """Colour of scanline y, matching the original per-line int() truncation."""
+    t = y / height
+    return (int(top[0] * (1 - t) + bottom[0] * t),
+            int(top[1] * (1 - t) + bottom[1] * t),
+            int(top[2] * (1 - t) + bottom[2] * t))
+
+
+def draw_gradient_lines(surface, state):
+    """Uncached reference path: one draw.line per scanline (used for benchmarks)."""
+    top, bottom = GRADIENTS[state]
+    width, height = surface.get_size()
+    for y in range(height):
+        pygame.draw.line(surface, gradient_color(top, bottom, y, height), (0, y), (width, y))
+
+
+def build_gradient(state, size):
+    """Render a gradient once: fill a 1px column, then stretch it across the width."""
+    top, bottom = GRADIENTS[state]
+    width, height = size
+    column = pygame.Surface((1, height))
+    for y in range(height):
+        column.set_at((0, y), gradient_color(top, bottom, y, height))
+    surf = pygame.transform.scale(column, (width, height))
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert()
+    return surf
+
+
+# -------------------------
+# Background cache
+# -------------------------
+class BackgroundCache:
+    """Per-state gradient surfaces, built lazily and rebuilt when the target size changes."""
+
+    def __init__(self):
+        self.size = None
+        self.surfaces = {}
+
+    def get(self, state, size):
+        if size != self.size:
+            # window size changed (or first use): drop everything built for the old size
+            self.surfaces = {}
+            self.size = size
+        surf = self.surfaces.get(state)
+        if surf is None:
+            surf = build_gradient(state, size)
+            self.surfaces[state] = surf
+        return surf
+
+    def warm(self, size):
+        """Build every state's gradient up front so the first frame of each state is not a hitch."""
+        for state in GRADIENTS:
+            self.get(state, size)
+
+    def draw(self, surface, state):
+        surface.blit(self.get(state, surface.get_size()), (0, 0))
+
+
+# -------------------------
+# Frame-time comparison
+# -------------------------
+def measure(frames=300, size=(480, 720)):
+    """Return mean ms per frame for the per-line path vs the cached blit, per state."""
+    from time import perf_counter
+    screen = pygame.display.set_mode(size)
+    cache = BackgroundCache()
+    cache.warm(size)
+    results = {}
+    for state in GRADIENTS:
+        t0 = perf_counter()
+        for _ in range(frames):
+            draw_gradient_lines(screen, state)
+        lines_ms = (perf_counter() - t0) * 1000 / frames
+        t0 = perf_counter()
+        for _ in range(frames):
+            cache.draw(screen, state)
+        cached_ms = (perf_counter() - t0) * 1000 / frames
+        results[state] = (lines_ms, cached_ms)
+    return results
+
+
+if __name__ == "__main__":
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    for state, (lines_ms, cached_ms) in measure().items():
+        print(f"{state:9s} per-line {lines_ms:7.3f} ms   cached {cached_ms:7.3f} ms   "
+              f"x{lines_ms / max(cached_ms, 1e-9):.1f}")
+    pygame.quit()
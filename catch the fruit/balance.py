@@ -0,0 +1,247 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import simulation
+from simulation import TICK_RATE, TICK_DT, GameState, chase_policy, step
+
+# -------------------------
+# Monte-Carlo balancing runner
+# -------------------------
+# Plays many headless games for every point of a parameter sweep and reports the
+# score, level-reached and lifetime distributions. Games are split into chunks that
+# run on a process pool, one chunk per task, so throughput grows with the core count;
+# each finished chunk is folded into the report right away and appended to a JSONL
+# log, so a long sweep can be stopped (Ctrl-C) at any point and keeps what it has.
+#
+# A sweep config is JSON:
+#
+#   {"games": 400, "policy": "chase", "max_minutes": 10, "seed": 1,
+#    "base":  {"COMBO_RESET_MS": 1800},
+#    "sweep": {"LEVEL_SPEEDUP": [0.3, 0.45, 0.6], "fruit_types.2.speed": [5.0, 6.0]}}
+#
+# "base" applies to every point, "sweep" lists the values to cross. Every point plays
+# the same game seeds, so differences between points are not sampling noise in the RNG.
+
+TUNABLE = ("LASER_INTERVAL", "LASER_DURATION", "MYSTERY_INTERVAL", "SUPER_DURATION", "FREEZE_DURATION",
+           "SLOW_DURATION", "REVERSE_DURATION", "RESIZE_DURATION", "COMBO_RESET_MS",
+           "POWER_PER_CATCH", "LEVEL_SPEEDUP")
+FRUIT_FIELDS = ("speed", "points", "size")
+CHUNK_GAMES = 25
+DEFAULT_GAMES = 200
+
+
+class ConfigError(Exception):
+    pass
+
+# -------------------------
+# Parameters
+# -------------------------
+_defaults = {name: getattr(simulation, name) for name in TUNABLE}
+_default_fruit = [dict(f) for f in simulation.FRUIT_TYPES]
+
+
+def check_params(params):
+    for key in params:
+        if key in TUNABLE:
+            continue
+        parts = key.split(".")
+        if (len(parts) != 3 or parts[0] != "fruit_types" or not parts[1].isdigit()
+                or int(parts[1]) >= len(_default_fruit) or parts[2] not in FRUIT_FIELDS):
+            raise ConfigError(f"unknown parameter {key!r} (tunable: {', '.join(TUNABLE)}, "
+                              f"fruit_types.<0-{len(_default_fruit) - 1}>.<{'|'.join(FRUIT_FIELDS)}>)")
+
+
+def apply_params(params):
+    """Set simulation's module constants for this process (defaults for anything not given)."""
+    for name in TUNABLE:
+        setattr(simulation, name, params.get(name, _defaults[name]))
+    fruit = [dict(f) for f in _default_fruit]
+    for key, value in params.items():
+        if key.startswith("fruit_types."):
+            _, index, field = key.split(".")
+            fruit[int(index)][field] = value
+    simulation.FRUIT_TYPES[:] = fruit
+
+# -------------------------
+# Policies (factories: one fresh policy per game, seeded independently of the game)
+# -------------------------
+def _chase(seed):
+    return chase_policy
+
+
+def _idle(seed):
+    return lambda state: 0
+
+
+def _sloppy(seed):
+    """Chase bot that reacts late: it keeps its previous input 30% of the time."""
+    rng = random.Random(seed)
+    last = [0]
+
+    def policy(state):
+        if rng.random() >= 0.3:
+            last[0] = chase_policy(state)
+        return last[0]
+    return policy
+
+
+POLICIES = {"chase": _chase, "sloppy": _sloppy, "idle": _idle}
+
+# -------------------------
+# Worker
+# -------------------------
+def play_chunk(params, policy, seeds, max_ticks):
+    """Play one game per seed with params applied; returns [(score, level, ticks), ...]."""
+    apply_params(params)
+    make_policy = POLICIES[policy]
+    results = []
+    for seed in seeds:
+        state = GameState(random.Random(seed))
+        act = make_policy(seed ^ 0x5EED)
+        while not state.over and state.tick < max_ticks:
+            step(state, act(state), TICK_DT)
+        results.append((state.score, state.level, state.tick))
+    return results
+
+# -------------------------
+# Aggregation
+# -------------------------
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0
+
+
+def _distribution(values):
+    ordered = sorted(values)
+    return {"mean": sum(ordered) / len(ordered) if ordered else 0,
+            "p10": _quantile(ordered, 0.10), "p50": _quantile(ordered, 0.50),
+            "p90": _quantile(ordered, 0.90), "max": ordered[-1] if ordered else 0}
+
+
+class PointStats:
+    """Running results of one sweep point."""
+
+    def __init__(self, params):
+        self.params = params
+        self.scores = []
+        self.levels = []
+        self.ticks = []
+
+    def add(self, results):
+        for score, level, ticks in results:
+            self.scores.append(score)
+            self.levels.append(level)
+            self.ticks.append(ticks)
+
+    def report(self):
+        levels = {}
+        for level in self.levels:
+            levels[level] = levels.get(level, 0) + 1
+        return {"params": self.params, "games": len(self.scores),
+                "score": _distribution(self.scores),
+                "lifetime_s": _distribution([t / TICK_RATE for t in self.ticks]),
+                "level": _distribution(self.levels),
+                "levels_reached": {str(k): levels[k] for k in sorted(levels)}}
+
+
+def sweep_points(config):
+    """The cartesian product of config["sweep"], each merged over config["base"]."""
+    base = dict(config.get("base", {}))
+    sweep = config.get("sweep", {})
+    names = list(sweep)
+    points = []
+    for values in itertools.product(*(sweep[name] for name in names)):
+        params = dict(base)
+        params.update(zip(names, values))
+        points.append(params)
+    for params in points:
+        check_params(params)
+    return points
+
+
+def run_sweep(config, workers=None, log=None, chunk=CHUNK_GAMES, progress=None):
+    """Run every point of the sweep; returns the list of point reports (partial if interrupted)."""
+    points = sweep_points(config)
+    games = config.get("games", DEFAULT_GAMES)
+    policy = config.get("policy", "chase")
+    if policy not in POLICIES:
+        raise ConfigError(f"unknown policy {policy!r} (one of {', '.join(POLICIES)})")
+    max_ticks = int(config.get("max_minutes", 10) * 60 * TICK_RATE)
+    first_seed = config.get("seed", 1) * 1_000_000
+    stats = [PointStats(p) for p in points]
+    total = len(points) * games
+    done = 0
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # interleave the points so a stopped sweep has a little of every point
+        futures = {}
+        for start in range(0, games, chunk):
+            seeds = list(range(first_seed + start, first_seed + min(games, start + chunk)))
+            for index, params in enumerate(points):
+                futures[executor.submit(play_chunk, params, policy, seeds, max_ticks)] = index
+        for future in as_completed(futures):
+            index = futures[future]
+            results = future.result()
+            stats[index].add(results)
+            done += len(results)
+            if log:
+                log.write(json.dumps({"point": index, "params": points[index], "results": results}) + "\n")
+                log.flush()
+            if progress:
+                progress(done, total, stats)
+    except KeyboardInterrupt:
+        print("\ninterrupted: reporting the games finished so far", file=sys.stderr)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return [s.report() for s in stats]
+
+
+def print_table(reports):
+    print(f"{'games':>6} {'score mean/p50/p90':>20} {'level p50/p90':>14} {'life s mean/p50':>16}  params")
+    for r in reports:
+        s, lv, life = r["score"], r["level"], r["lifetime_s"]
+        params = ", ".join(f"{k}={v}" for k, v in r["params"].items()) or "(defaults)"
+        print(f"{r['games']:>6} {s['mean']:>8.1f} /{s['p50']:>4} /{s['p90']:>4} {lv['p50']:>8}/{lv['p90']:<5}"
+              f" {life['mean']:>9.1f} /{life['p50']:>5.1f}  {params}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte-Carlo balancing sweeps for Catch the Fruit")
+    parser.add_argument("config", help="sweep config (JSON)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_GAMES, help="games per task")
+    parser.add_argument("--out", help="write the final report here (JSON)")
+    parser.add_argument("--log", help="append every finished chunk here as it arrives (JSONL)")
+    args = parser.parse_args()
+
+    try:
+        with open(args.config) as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        sys.exit(f"{args.config}: {e}")
+
+    t0 = time.perf_counter()
+
+    def progress(done, total, stats):
+        rate = done / max(time.perf_counter() - t0, 1e-9)
+        print(f"\r{done}/{total} games ({rate:,.0f} games/s)", end="", file=sys.stderr, flush=True)
+
+    log = open(args.log, "a") if args.log else None
+    try:
+        reports = run_sweep(config, args.workers, log, args.chunk, progress)
+    except ConfigError as e:
+        sys.exit(f"{args.config}: {e}")
+    finally:
+        if log:
+            log.close()
+    print(file=sys.stderr)
+    print_table(reports)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"config": config, "elapsed_s": time.perf_counter() - t0, "points": reports}, f, indent=2)
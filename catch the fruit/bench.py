@@ -0,0 +1,245 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+# Headless by default; set SDL_VIDEODRIVER yourself to bench a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+import catchthefallingfruit as game_module
+from profiling import SECTIONS, PhaseTimer, summarize
+from simulation import INPUT_SPACE, chase_policy
+
+# -------------------------
+# Frame-time benchmark
+# -------------------------
+# Runs the real run_game loop with a scripted input sequence and a fixed frame time:
+# MENU frames on the title screen, PLAYING frames with the chase bot at the controls
+# (restarting if it loses early), then GAMEOVER frames on the game over screen. Every
+# frame is timed per section; a second, separate pass traces Python allocations per
+# frame, since tracemalloc slows everything down.
+#
+#   python bench.py --out result.json
+#   python bench.py --compare baseline.json --tolerance 0.15
+#   python bench.py --throughput        # serial loop vs render thread, wall-clock fps
+
+MENU_FRAMES = 120
+PLAYING_FRAMES = 1200
+GAMEOVER_FRAMES = 120
+SEED = 1234
+
+
+class BenchScript:
+    """Scripted run_game driver: title screen, a bot-played game, then game over."""
+
+    def __init__(self, menu, playing, gameover, dt=1 / 60, on_frame=None):
+        self.menu = menu
+        self.playing = playing
+        self.gameover = gameover
+        self.dt = dt
+        self.on_frame = on_frame
+
+    def frame(self, index, screen, game):
+        if self.on_frame:
+            self.on_frame(index)
+        if index >= self.menu + self.playing + self.gameover:
+            return None
+        if index < self.menu:
+            return 0
+        if index < self.menu + self.playing:
+            if screen != "playing":
+                # start the game (and restart it if the bot lost early)
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+                return 0
+            bits = chase_policy(game)
+            if bits & INPUT_SPACE:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+            return bits
+        if screen == "playing":
+            game.lives = 0   # end the game on the next tick
+        return 0
+
+
+class AllocationProbe:
+    """Per-frame traced allocation: peak bytes above the frame's starting level."""
+
+    def __init__(self):
+        self.samples = []
+        self.start = None
+
+    def __call__(self, index):
+        current, peak = tracemalloc.get_traced_memory()
+        if self.start is not None:
+            self.samples.append(peak - self.start)
+        tracemalloc.reset_peak()
+        self.start = current
+
+
+def _run(storm, menu, playing, gameover, timer=None, on_frame=None, **options):
+    # Fixed seeds for both the games and the background lines
+    random.seed(SEED)
+    script = BenchScript(menu, playing, gameover, on_frame=on_frame)
+    game_module.run_game(storm=storm, render_mode="uncapped", seed=SEED, script=script, timer=timer,
+                         **options)
+
+
+@contextlib.contextmanager
+def _scratch():
+    """Run in a temporary directory so the benchmark's high score and replays stay out of the real ones."""
+    cwd = os.getcwd()
+    replay_dir = game_module.REPLAY_DIR
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        game_module.REPLAY_DIR = None
+        try:
+            yield
+        finally:
+            game_module.REPLAY_DIR = replay_dir
+            os.chdir(cwd)
+            pygame.quit()
+
+
+def run_bench(storm=0, menu=MENU_FRAMES, playing=PLAYING_FRAMES, gameover=GAMEOVER_FRAMES, allocations=True,
+              **options):
+    """Run the scripted phases and return the result dict (times in ms).
+
+    Extra keyword options (e.g. dirty_rects=True) are passed on to run_game.
+    """
+    with _scratch():
+        # warm-up pass so caches and lazily built sprites do not count
+        _run(storm, min(menu, 30), min(playing, 60), min(gameover, 30), **options)
+        timer = PhaseTimer()
+        _run(storm, menu, playing, gameover, timer=timer, **options)
+        probe = None
+        if allocations:
+            probe = AllocationProbe()
+            tracemalloc.start()
+            try:
+                _run(storm, menu, playing, gameover, on_frame=probe, **options)
+            finally:
+                tracemalloc.stop()
+
+    result = {"storm": storm, "frames": {"menu": menu, "playing": playing, "gameover": gameover},
+              "driver": os.environ.get("SDL_VIDEODRIVER", ""), "options": options, "phases": {}}
+    for screen, frames in timer.frames.items():
+        phase = {"frame": summarize([f["total"] / 1e6 for f in frames]), "sections": {}}
+        for section in SECTIONS:
+            values = [f[section] / 1e6 for f in frames if section in f]
+            if values:
+                phase["sections"][section] = summarize(values + [0.0] * (len(frames) - len(values)))
+        result["phases"][screen] = phase
+    if probe is not None:
+        result["allocations"] = {"bytes_per_frame": summarize(probe.samples)}
+    return result
+
+
+def run_throughput(storm=0, menu=MENU_FRAMES, playing=PLAYING_FRAMES, gameover=GAMEOVER_FRAMES, repeats=3,
+                   **options):
+    """Wall-clock frames per second of the whole scripted loop, serial and pipelined.
+
+    The pipelined run uses pipeline="every", so it draws exactly the frames the serial
+    run draws; the best of repeats runs is kept for each.
+    """
+    frames = menu + playing + gameover
+    result = {"storm": storm, "frames": frames, "cpus": os.cpu_count(), "options": options, "fps": {}}
+    with _scratch():
+        _run(storm, min(menu, 30), min(playing, 60), min(gameover, 30), **options)
+        for label, pipeline in (("serial", None), ("pipeline", "every")):
+            best = None
+            for _ in range(repeats):
+                t0 = perf_counter()
+                _run(storm, menu, playing, gameover, pipeline=pipeline, **options)
+                elapsed = perf_counter() - t0
+                best = elapsed if best is None else min(best, elapsed)
+            result["fps"][label] = frames / best
+    result["speedup"] = result["fps"]["pipeline"] / result["fps"]["serial"]
+    return result
+
+
+def compare(result, baseline, tolerance):
+    """Regressions of result vs baseline beyond tolerance (fraction), as readable lines."""
+    failures = []
+    for screen, phase in baseline["phases"].items():
+        current = result["phases"].get(screen)
+        if current is None:
+            failures.append(f"{screen}: phase missing from this run")
+            continue
+        for stat in ("mean", "p99"):
+            old = phase["frame"][stat]
+            new = current["frame"][stat]
+            if new > old * (1 + tolerance):
+                failures.append(f"{screen} frame {stat}: {old:.3f} ms -> {new:.3f} ms "
+                                f"(+{(new / old - 1) * 100:.0f}%, limit +{tolerance * 100:.0f}%)")
+    old = baseline.get("allocations", {}).get("bytes_per_frame", {}).get("mean")
+    new = result.get("allocations", {}).get("bytes_per_frame", {}).get("mean")
+    if old is not None and new is not None and new > old * (1 + tolerance) + 1024:
+        failures.append(f"allocations per frame: {old:.0f} B -> {new:.0f} B")
+    return failures
+
+
+def print_report(result):
+    for screen, phase in result["phases"].items():
+        f = phase["frame"]
+        print(f"{screen:9} frame mean {f['mean']:.3f} ms"
+              f"  p50 {f['p50']:.3f}  p99 {f['p99']:.3f}")
+        for section, s in phase["sections"].items():
+            print(f"    {section:11} mean {s['mean']:.3f}  p50 {s['p50']:.3f}  p99 {s['p99']:.3f}")
+    if "allocations" in result:
+        a = result["allocations"]["bytes_per_frame"]
+        print(f"allocations  mean {a['mean']:.0f} B/frame  p50 {a['p50']}  p99 {a['p99']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Catch the Fruit frame-time benchmark")
+    parser.add_argument("--storm", type=int, default=0, metavar="N")
+    parser.add_argument("--menu", type=int, default=MENU_FRAMES)
+    parser.add_argument("--playing", type=int, default=PLAYING_FRAMES)
+    parser.add_argument("--gameover", type=int, default=GAMEOVER_FRAMES)
+    parser.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--dirty-rects", action="store_true", help="bench the dirty-rect renderer")
+    parser.add_argument("--capture", action="store_true",
+                        help="capture every frame (into a 2 s ring in the scratch directory)")
+    parser.add_argument("--out", help="write the result as JSON here")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if slower than this JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed slowdown vs the baseline (fraction, default 0.10)")
+    parser.add_argument("--throughput", action="store_true",
+                        help="compare whole-loop fps with and without the render thread instead")
+    args = parser.parse_args()
+
+    if args.throughput:
+        result = run_throughput(args.storm, args.menu, args.playing, args.gameover, dirty_rects=args.dirty_rects)
+        print(f"{result['frames']} frames on {result['cpus']} CPU(s): serial {result['fps']['serial']:.0f} fps, "
+              f"render thread {result['fps']['pipeline']:.0f} fps (x{result['speedup']:.2f})")
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(result, f, indent=2)
+        sys.exit(0)
+
+    options = {"dirty_rects": args.dirty_rects}
+    if args.capture:
+        options.update(capture="bench.ctfv", capture_fps=60, capture_seconds=2)
+    result = run_bench(args.storm, args.menu, args.playing, args.gameover, allocations=not args.no_alloc,
+                       **options)
+    print_report(result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        failures = compare(result, baseline, args.tolerance)
+        if failures:
+            print("\nREGRESSION vs " + args.compare + ":")
+            for line in failures:
+                print("  " + line)
+            sys.exit(1)
+        print("\nno regression vs " + args.compare)
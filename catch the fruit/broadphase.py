@@ -0,0 +1,196 @@
+import numpy as np
+
+# -------------------------
+# Uniform-grid broadphase
+# -------------------------
+# Entities are bucketed by the grid cell of their centre over a bounded playfield
+# (anything outside is clamped into the border cells). Cell ids are small integers, so
+# sorting them each tick is a linear radix sort, and every row of cells a query rect
+# touches is one contiguous run of the sorted ids, found with two binary searches.
+# A query costs O(rows * log n + candidates) instead of touching every entity.
+# Candidates are then confirmed with an exact test.
+#
+# Fruit storms of STORM_GRID_MIN fruits or more (simulation.py) find their paddle
+# candidates this way (FruitStore.caught). Building the grid is still linear in the
+# entity count, only with fewer array passes than the exact swept test, so below that
+# size the whole-array test is cheaper. `python broadphase.py` times both.
+
+CELL_SIZE = 64
+MARGIN = 256   # off-screen band (spawn area above, miss area below) still bucketed
+
+
+class GridBroadphase:
+    """Sorted-cell spatial hash over entity centres with per-entity half-extents."""
+
+    def __init__(self, width=480, height=720, cell=CELL_SIZE, margin=MARGIN):
+        self.cell = cell
+        self.inv_cell = 1.0 / cell
+        self.origin = -margin
+        self.cols = (width + 2 * margin) // cell + 1
+        self.rows = (height + 2 * margin) // cell + 1
+        self.order = np.zeros(0, dtype=np.int64)
+        self.keys = np.zeros(0, dtype=np.int16)
+        self.max_extent = 0.0
+
+    def _col(self, x):
+        return min(max(int((x - self.origin) * self.inv_cell), 0), self.cols - 1)
+
+    def _row(self, y):
+        return min(max(int((y - self.origin) * self.inv_cell), 0), self.rows - 1)
+
+    def _cells(self, vs, count):
+        # truncating to int and clamping as ints costs a fraction of a float floor
+        # division and np.clip; truncation only differs from floor below 0, clamped anyway
+        cells = ((vs - self.origin) * self.inv_cell).astype(np.int16)
+        np.maximum(cells, 0, out=cells)
+        np.minimum(cells, count - 1, out=cells)
+        return cells
+
+    def build(self, xs, ys, extents):
+        """Index entities at centres (xs, ys); extents is each one's half-width/height."""
+        keys = self._cells(ys, self.rows)
+        keys *= np.int16(self.cols)
+        keys += self._cells(xs, self.cols)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+        self.max_extent = float(extents.max()) if len(extents) else 0.0
+
+    def query(self, x, y, w, h):
+        """Indices of entities whose box may overlap the rect (x, y, w, h)."""
+        if not len(self.keys):
+            return self.order
+        pad = self.max_extent
+        c0 = self._col(x - pad)
+        c1 = self._col(x + w + pad)
+        keys = self.keys
+        runs = []
+        for row in range(self._row(y - pad), self._row(y + h + pad) + 1):
+            lo = np.searchsorted(keys, row * self.cols + c0, "left")
+            hi = np.searchsorted(keys, row * self.cols + c1, "right")
+            if hi > lo:
+                runs.append(self.order[lo:hi])
+        if not runs:
+            return self.order[:0]
+        return runs[0] if len(runs) == 1 else np.concatenate(runs)
+
+    def pairs(self, rects):
+        """Candidate (rect index, entity index) pairs for a list of query rects."""
+        out = []
+        for i, (x, y, w, h) in enumerate(rects):
+            for j in self.query(x, y, w, h).tolist():
+                out.append((i, j))
+        return out
+
+    def hits(self, rects, xs, ys, extents, exact=None):
+        """Confirmed (rect index, entity index) pairs; exact defaults to aabb_hits."""
+        exact = exact or aabb_hits
+        out = []
+        for i, (x, y, w, h) in enumerate(rects):
+            for j in exact(self.query(x, y, w, h), xs, ys, extents, x, y, w, h).tolist():
+                out.append((i, j))
+        return out
+
+# -------------------------
+# Narrow phase (exact tests over candidate indices)
+# -------------------------
+def aabb_hits(idx, xs, ys, extents, x, y, w, h):
+    """Candidates whose integer box (centre +/- extent) overlaps the rect, colliderect-style."""
+    e = extents[idx]
+    bx = (xs[idx] - e).astype(np.int64)
+    by = (ys[idx] - e).astype(np.int64)
+    hit = (x < bx + e * 2) & (bx < x + w) & (y < by + e * 2) & (by < y + h)
+    return idx[hit]
+
+
+def circle_hits(idx, xs, ys, radii, x, y, w, h):
+    """Candidates whose circle overlaps the rect (closest-point distance test)."""
+    cx = xs[idx]
+    cy = ys[idx]
+    dx = cx - np.clip(cx, x, x + w)
+    dy = cy - np.clip(cy, y, y + h)
+    r = radii[idx]
+    return idx[dx * dx + dy * dy < r * r]
+
+# -------------------------
+# Benchmark
+# -------------------------
+def _bench(counts=(100, 1000, 10000, 100000), paddles=8, repeats=50, width=480, height=720):
+    from time import perf_counter
+    rng = np.random.default_rng(0)
+    rects = [(float(x), float(height - 90), 60.0, 44.0)
+             for x in np.linspace(6, width - 66, paddles)]
+    print(f"{paddles} paddle rects, times per tick")
+    print(f"{'entities':>9} {'pairwise py':>12} {'numpy brute':>12} {'grid build':>11} {'grid query':>11}")
+    for n in counts:
+        xs = rng.uniform(0, width, n)
+        ys = rng.uniform(-160, height + 30, n)
+        ext = rng.integers(18, 29, n).astype(np.int64)
+        grid = GridBroadphase(width, height)
+
+        # pairwise Python loop (what per-object colliderect costs); skipped when huge
+        pairwise = "-"
+        if n <= 10000:
+            xl, yl, el = xs.tolist(), ys.tolist(), ext.tolist()
+            t0 = perf_counter()
+            for _ in range(max(1, repeats // 10)):
+                for (x, y, w, h) in rects:
+                    for fx, fy, e in zip(xl, yl, el):
+                        bx, by = int(fx - e), int(fy - e)
+                        if x < bx + e * 2 and bx < x + w and y < by + e * 2 and by < y + h:
+                            pass
+            pairwise = f"{(perf_counter() - t0) * 1e6 / max(1, repeats // 10):.0f}us"
+
+        all_idx = np.arange(n)
+        t0 = perf_counter()
+        for _ in range(repeats):
+            for (x, y, w, h) in rects:
+                aabb_hits(all_idx, xs, ys, ext, x, y, w, h)
+        brute = (perf_counter() - t0) * 1e6 / repeats
+
+        t0 = perf_counter()
+        for _ in range(repeats):
+            grid.build(xs, ys, ext)
+        build = (perf_counter() - t0) * 1e6 / repeats
+
+        t0 = perf_counter()
+        for _ in range(repeats):
+            for (x, y, w, h) in rects:
+                aabb_hits(grid.query(x, y, w, h), xs, ys, ext, x, y, w, h)
+        query = (perf_counter() - t0) * 1e6 / repeats
+        print(f"{n:>9} {pairwise:>12} {brute:>10.0f}us {build:>9.0f}us {query:>9.0f}us")
+
+
+
+def _storm_bench(counts=(1000, 5000, 7000, 10000, 50000), ticks=300):
+    """Storm paddle test per tick, whole-array vs grid, checking both catch the same fruits."""
+    from time import perf_counter
+    from entities import fruit_kinds
+    from fruit_store import FruitStore
+    from simulation import FRUIT_TYPES, WIDTH, HEIGHT, STORM_GRID_MIN
+    kinds = fruit_kinds(FRUIT_TYPES)
+    grid = GridBroadphase(WIDTH, HEIGHT)
+    print(f"storm paddle test per tick (the game uses the grid from {STORM_GRID_MIN} fruits)")
+    for n in counts:
+        store = FruitStore(n, seed=0)
+        store.spawn(n, WIDTH, kinds)
+        store.y[:n] = store.rng.uniform(-160, HEIGHT + 30, n)
+        whole = gridded = 0.0
+        for tick in range(ticks):
+            store.update(1.0)
+            px0 = 6 + (tick * 7) % (WIDTH - 72)
+            px1 = px0 + 7
+            t0 = perf_counter()
+            a = store.caught(int(px1), HEIGHT - 90, 60, 44, px0, px1)
+            t1 = perf_counter()
+            b = store.caught(int(px1), HEIGHT - 90, 60, 44, px0, px1, grid)
+            t2 = perf_counter()
+            assert (a == b).all(), f"grid missed or added catches at {n} fruits, tick {tick}"
+            whole += t1 - t0
+            gridded += t2 - t1
+        print(f"{n:>9} fruits: whole array {whole * 1e6 / ticks:6.0f}us, grid {gridded * 1e6 / ticks:6.0f}us, "
+              f"same catches")
+
+
+if __name__ == "__main__":
+    _bench()
+    _storm_bench()
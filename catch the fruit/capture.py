@@ -0,0 +1,269 @@
+import atexit
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+
+import pygame
+
+# -------------------------
+# Frame capture
+# -------------------------
+# Records the game as raw frames for attract loops and bug reports. The file is
+# allocated up front and memory-mapped. The renderer only hands the finished screen's
+# pixel buffer to a copy thread, which copies it into the mapping (no pixels pass
+# through Python objects) while the renderer flips and waits for the next frame; the
+# next frame waits for that copy before drawing over the screen. A second thread syncs
+# the written pages to disk every FLUSH_FRAMES frames, so nothing waits for the disk.
+# The file is a ring: when it is full the oldest frames are overwritten, so it always
+# holds the last `seconds` of play. Screens that are not 32-bit are converted first.
+#
+#   header  "CTFV", version, width, height, pitch (bytes per row), fps, pixel format
+#           (channel order of the 4 bytes of a pixel in memory, e.g. b"BGRX"),
+#           capacity (frames), frames captured so far
+#   frames  capacity slots of pitch * height bytes from DATA_OFFSET; frame n is in
+#           slot n % capacity
+#
+# `python capture.py export FILE DIR` writes the frames out as a PNG sequence.
+
+MAGIC = b"CTFV"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHIH4sII")
+COUNT = struct.Struct("<I")            # last header field, rewritten per frame
+COUNT_OFFSET = HEADER.size - COUNT.size
+DATA_OFFSET = 64
+CAPTURE_FPS = 30
+CAPTURE_SECONDS = 10      # ring length; 10 s at 30 fps of 480x720 is about 400 MB
+FLUSH_FRAMES = 30         # frames between background syncs
+MAX_REPEAT = 4            # a slow frame is repeated at most this often to keep the timing
+
+
+log = logging.getLogger(__name__)
+
+
+class CaptureError(Exception):
+    pass
+
+
+def pixel_format(surface):
+    """Channel order of a 32-bit surface's pixel bytes in memory, e.g. b"BGRX"."""
+    if surface.get_bytesize() != 4:
+        raise CaptureError(f"can only capture 32-bit surfaces, not {surface.get_bitsize()}-bit")
+    order = [b"X"] * 4
+    for channel, mask, shift in zip(b"RGBA", surface.get_masks(), surface.get_shifts()):
+        if mask:
+            order[shift // 8] = bytes([channel])
+    if sys.byteorder == "big":
+        order.reverse()
+    return b"".join(order)
+
+
+class FrameCapture:
+    """Ring of raw frames in a preallocated memory-mapped file, synced in the background."""
+
+    def __init__(self, path, surface, fps=CAPTURE_FPS, seconds=CAPTURE_SECONDS):
+        self.path = path
+        # 16/24-bit screens are blitted to a 32-bit copy, so every capture has one format
+        self.scratch = None if surface.get_bytesize() == 4 else pygame.Surface(surface.get_size(), 0, 32)
+        if self.scratch:
+            surface = self.scratch
+        self.width, self.height = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.frame_size = self.pitch * self.height
+        self.fps = fps
+        self.capacity = max(1, int(fps * seconds))
+        self.count = 0
+        self.due = None           # seconds of play not yet captured
+        self.closed = False
+        self.pending = None       # (pixel buffer, copies) handed to the copy thread
+        self.failed = None        # the copy thread's exception; recording has stopped
+        self.size = size = DATA_OFFSET + self.capacity * self.frame_size
+        self.file = open(path, "w+b")
+        self.file.truncate(size)
+        try:
+            # reserve the blocks now instead of on the first write to each page
+            os.posix_fallocate(self.file.fileno(), 0, size)
+        except (AttributeError, OSError):
+            pass
+        self.map = mmap.mmap(self.file.fileno(), size)
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, self.width, self.height, self.pitch, fps,
+                         pixel_format(surface), self.capacity, 0)
+        self.copy_wanted = threading.Event()
+        self.copied = threading.Event()
+        self.flush_wanted = threading.Event()
+        self.copier = threading.Thread(target=self._copy, name="capture-copy", daemon=True)
+        self.copier.start()
+        self.thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def frame(self, surface, dt):
+        """Capture surface if dt (seconds since the last call) completes a capture frame.
+
+        The copy finishes in the background: call wait() before drawing into surface again.
+        Once a copy has failed this does nothing, so a broken capture never stops the game.
+        """
+        self.wait()
+        if self.failed:
+            return 0
+        if self.due is None:      # the first frame is always captured
+            self.due, n = 0.0, 1
+        else:
+            self.due += dt
+            n = int(self.due * self.fps)
+            if not n:
+                return 0
+            self.due -= n / self.fps
+        n = min(n, MAX_REPEAT)
+        if self.scratch:
+            self.scratch.blit(surface, (0, 0))
+            surface = self.scratch
+        # the buffer keeps the surface locked until wait() drops it
+        self.pending = (surface.get_buffer(), n)
+        self.copy_wanted.set()
+        return n
+
+    def wait(self):
+        """Block until the last captured frame has been copied out of the surface."""
+        if self.pending is not None:
+            if not self.failed:
+                self.copied.wait()
+            self.copied.clear()
+            self.pending = None       # unlocks the surface
+
+    def _copy(self):
+        # a slice copy into the mapping holds the GIL only for one memcpy; the renderer
+        # spends that time in the flip and the frame-rate wait, which release it
+        while True:
+            self.copy_wanted.wait()
+            self.copy_wanted.clear()
+            if self.closed:
+                return
+            try:
+                pixels, n = self.pending
+                for _ in range(n):
+                    start = DATA_OFFSET + (self.count % self.capacity) * self.frame_size
+                    self.map[start:start + self.frame_size] = pixels
+                    self.count += 1
+                del pixels
+                COUNT.pack_into(self.map, COUNT_OFFSET, self.count)
+                if self.count % FLUSH_FRAMES < n:
+                    self.flush_wanted.set()
+            except Exception as e:
+                # set before copied, so frame() stops handing over work nobody will take
+                self.failed = e
+                log.exception("capture to %s failed after %d frames; recording stopped",
+                              self.path, self.count)
+            finally:
+                self.copied.set()
+            if self.failed:
+                return
+
+    def _run(self):
+        # fdatasync releases the GIL, so the game keeps running while pages are written
+        fd = self.file.fileno()
+        while True:
+            self.flush_wanted.wait()
+            self.flush_wanted.clear()
+            if self.closed:
+                return
+            if hasattr(os, "fdatasync"):
+                os.fdatasync(fd)
+            else:
+                os.fsync(fd)
+
+    def close(self):
+        """Sync everything captured and close the file."""
+        if self.closed:
+            return
+        self.wait()
+        self.closed = True
+        self.copy_wanted.set()
+        self.copier.join()
+        self.flush_wanted.set()
+        self.thread.join()
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+
+class CaptureFile:
+    """Read side of a capture: header fields and frames in recording order."""
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise CaptureError("not a capture: empty file")
+        if len(self.map) < DATA_OFFSET:
+            raise CaptureError("not a capture: file too short")
+        (magic, version, self.width, self.height, self.pitch, self.fps, self.format,
+         self.capacity, self.count) = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise CaptureError("not a capture: bad magic")
+        if version != VERSION:
+            raise CaptureError(f"unsupported capture version {version}")
+        self.frame_size = self.pitch * self.height
+        self.frames = min(self.count, self.capacity)
+
+    def frame(self, i):
+        """Pixels of the i-th oldest frame still in the file (a memoryview, no copy)."""
+        slot = (self.count - self.frames + i) % self.capacity
+        start = DATA_OFFSET + slot * self.frame_size
+        return memoryview(self.map)[start:start + self.frame_size]
+
+    def rgb(self, i):
+        """The i-th frame as a (height, width, 3) uint8 NumPy array."""
+        import numpy as np
+        px = np.frombuffer(self.frame(i), np.uint8).reshape(self.height, self.pitch // 4, 4)
+        channels = [self.format.index(c) for c in b"RGB"]
+        return px[:, :self.width, channels]
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def export_png(path, directory, step=1):
+    """Write every step-th frame of a capture to directory/frame_00000.png ...; returns the count."""
+    capture = CaptureFile(path)
+    os.makedirs(directory, exist_ok=True)
+    written = 0
+    for i in range(0, capture.frames, step):
+        rgb = capture.rgb(i)
+        image = pygame.image.frombuffer(rgb.tobytes(), (capture.width, capture.height), "RGB")
+        pygame.image.save(image, os.path.join(directory, f"frame_{i:05}.png"))
+        written += 1
+    capture.close()
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and export Catch the Fruit frame captures")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info")
+    info.add_argument("file")
+    export = sub.add_parser("export", help="write the frames as a PNG sequence")
+    export.add_argument("file")
+    export.add_argument("directory")
+    export.add_argument("--step", type=int, default=1, metavar="N", help="export every N-th frame")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "info":
+            c = CaptureFile(args.file)
+            print(f"{args.file}: {c.width}x{c.height} {c.format.decode()} at {c.fps} fps, "
+                  f"{c.frames} frames ({c.frames / c.fps:.1f}s) of {c.count} captured, "
+                  f"room for {c.capacity}")
+            c.close()
+        else:
+            n = export_png(args.file, args.directory, args.step)
+            print(f"{args.file}: {n} frames written to {args.directory}")
+    except (OSError, CaptureError) as e:
+        print(f"{args.file}: {e}")
+        sys.exit(1)
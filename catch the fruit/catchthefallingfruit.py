@@ -1,186 +1,231 @@
 
 
+import time
+LAUNCHED = time.perf_counter()   # --startup-time counts from here, imports included
+
 import pygame
 import random
 import sys
 import os
 import traceback
-from math import sin, pi
+import argparse
+from math import sin
+
+from backgrounds import BackgroundCache
+from capture import CAPTURE_FPS, CAPTURE_SECONDS, CaptureError, FrameCapture
+from dirty_rects import DirtyRects
+from fonts import FontResolver
+from scaling import SCALE_MODES, SCALE_FILTERS, open_display
+from glow_atlas import GlowAtlas
+from leaderboard import Leaderboard
+from persist import PersistenceWorker
+from replay import Recorder, new_seed
+from pipeline import PIPELINE_MODES, Frame, RenderThread, SnapshotBuffer, merge_frames, snapshot
+from profiling import FrameProfiler, ProfilerOverlay, StartupTimer
+from quality import QUALITY_MODES, QualityGovernor
+from parallax import Parallax
+from palette import NEON_PINK, NEON_BLUE, NEON_GREEN, NEON_YELLOW, RED, GRAY, WHITE, PURPLE
+from simulation import (WIDTH, HEIGHT, SCORE_POP_LIFETIME, TICK_DT, INPUT_LEFT, INPUT_RIGHT, INPUT_SPACE,
+                        GameState, step, integrate, resolve, clamp)
+from text_cache import TextCache
+
+try:
+    from particles import ParticleSystem
+except ImportError:       # NumPy missing: play without particle effects
+    ParticleSystem = None
 
 # -------------------------
 # Configuration constants
 # -------------------------
-WIDTH, HEIGHT = 480, 720
-FPS = 60
-HIGH_SCORE_FILE = "highscore.txt"
-
-# Timers (milliseconds)
-LASER_INTERVAL = 8000      # spawn laser every 8s
-LASER_DURATION = 1200      # laser active for 1.2s
-MYSTERY_INTERVAL = 12000   # spawn mystery orb every 12s
-SUPER_DURATION = 4000      # super mode lasts 4s
-FREEZE_DURATION = 2000     # freeze time bonus duration
-SCORE_POP_LIFETIME = 700   # ms
+# Playfield size, game timers and the simulation tick rate live in simulation.py
+FPS = 60                  # render cap in "throttled" mode
+LEADERBOARD_FILE = "leaderboard.db"   # every finished run (SQLite, see leaderboard.py)
+HIGH_SCORE_FILE = "highscore.txt"     # old single high score, imported into a new leaderboard
+
+# Render pacing: "throttled" caps at FPS, "vsync" waits for the display, "uncapped" draws
+# as fast as possible. The simulation always runs at TICK_RATE regardless.
+RENDER_MODES = ("throttled", "vsync", "uncapped")
+MAX_TICKS_PER_FRAME = 8   # catch-up limit; beyond this the game slows instead of stalling
+MAX_FRAME_TIME = 0.25     # seconds; longer hitches (window drag, debugger) are not replayed
+
+# Every finished game is saved here as a replay (seed + input log); None disables
+REPLAY_DIR = "replays"
+
+# Rendered text surfaces kept by neon_text / score pops (LRU entries)
+TEXT_CACHE_SIZE = 256
+
+# F3 toggles the live profiler (section timings, frame graph overlay, periodic export)
+PROFILE_KEY = pygame.K_F3
+
+# P pauses a game: no ticks run, so the game clock and every game timer stop
+PAUSE_KEY = pygame.K_p
 
 # -------------------------
 # Helper functions
 # -------------------------
-def load_high_score(filename):
-    if os.path.exists(filename):
-        try:
-            with open(filename, "r") as f:
-                return int(f.read().strip() or 0)
-        except:
-            return 0
-    return 0
+def replay_path(directory, replay):
+    # the game's seed keeps two games ending in the same second with the same score apart
+    return os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + f"-{replay.score}-{replay.seed:016x}.ctfr")
 
-def save_high_score(filename, score):
-    try:
-        with open(filename, "w") as f:
-            f.write(str(score))
-    except:
-        pass
+def lerp(a, b, t):
+    return a + (b - a) * t
 
-def neon_text(surface, text, font, center, base_color, glow_color, glow_strength=3):
-    """Render glowing neon-like text by drawing layered 'glow' then base text."""
-    for i in range(glow_strength, 0, -1):
-        alpha = max(8, 80 - i * 18)
-        glow_surf = font.render(text, True, glow_color)
-        glow_surf.set_alpha(alpha)
-        glow_rect = glow_surf.get_rect(center=center)
-        surface.blit(glow_surf, glow_rect)
-    base_surf = font.render(text, True, base_color)
-    base_rect = base_surf.get_rect(center=center)
-    surface.blit(base_surf, base_rect)
-
-def clamp(v, a, b):
-    return max(a, min(b, v))
+def untracked(rect):
+    return rect
 
-# -------------------------
-# Spawn helpers
-# -------------------------
-def spawn_fruit(width, fruit_types):
-    f = random.choice(fruit_types)
-    return {
-        "x": random.randint(30, width - 30),
-        "y": -random.randint(20, 160),
-        "size": f["size"],
-        "speed": f["speed"],
-        "color": f["color"],
-        "points": f["points"],
-        "power": f.get("power", None),
-        "wobble": random.random() * 2 * pi
-    }
-
-def spawn_mystery(width):
-    return {
-        "x": random.randint(40, width - 40),
-        "y": -random.randint(30, 200),
-        "size": 18,
-        "speed": 3.5,
-        "type": "mystery",  # handled specially
-        "wobble": random.random() * 2 * pi
-    }
-
-def spawn_laser():
-    # Horizontal laser beam spans width at random Y; short lifetime
-    return {"y": random.randint(140, HEIGHT - 200), "start": pygame.time.get_ticks(), "active": True}
+def ticks_ms():
+    """Milliseconds since launch; animation clock (pygame.time.get_ticks needs pygame.init())."""
+    return int((time.perf_counter() - LAUNCHED) * 1000)
+
+text_cache = TextCache(TEXT_CACHE_SIZE)
+
+def neon_text(surface, text, font, center, base_color, glow_color, glow_strength=3):
+    """Render glowing neon-like text (layered glow under base text) from the text cache."""
+    surf = text_cache.neon(font, text, base_color, glow_color, glow_strength)
+    return surface.blit(surf, surf.get_rect(center=center), special_flags=pygame.BLEND_PREMULTIPLIED)
 
 # -------------------------
 # Main game
 # -------------------------
-def run_game():
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+def run_game(storm=0, render_mode="throttled", seed=None, script=None, timer=None,
+             profile=False, profile_out=None, dirty_rects=False,
+             scale="native", scale_filter="integer", fullscreen=False, pipeline=None, quality=None,
+             startup=None, capture=None, capture_fps=CAPTURE_FPS, capture_seconds=CAPTURE_SECONDS):
+    """Open the window and run the game; storm > 0 plays fruit storm mode with that many fruits.
+
+    seed fixes the sequence of game seeds. script (see bench.py) replaces the clock and the
+    keyboard: script.dt is the time of every frame and script.frame(index, screen, game)
+    returns the held INPUT_* bits, or None to make run_game return. timer (a
+    profiling.PhaseTimer) gets a mark after each section of every frame.
+    profile starts with the live profiler on (PROFILE_KEY toggles it); profile_out is
+    the .csv or .json file it exports to periodically. dirty_rects redraws and presents
+    only the regions that changed (see dirty_rects.py) instead of the whole screen.
+    scale / scale_filter pick how the WIDTH x HEIGHT frame is upscaled (see scaling.py).
+    pipeline (one of PIPELINE_MODES) draws and presents on a separate render thread from
+    per-frame snapshots (see pipeline.py); "latest" skips pictures the renderer cannot keep
+    up with, "every" makes the simulation wait for it. With a render thread, timer only
+    times this thread's sections.
+    quality is one of QUALITY_MODES: "auto" lets a QualityGovernor (see quality.py) trade
+    effect detail for frame time, a tier name fixes the detail. The default is "auto",
+    or the top tier for scripted runs so benchmarks always draw the same work.
+    startup (a profiling.StartupTimer) gets a mark after each startup step, and run_game
+    returns as soon as the first frame is on screen.
+    capture is a file that keeps the last capture_seconds of frames at capture_fps as raw
+    video (see capture.py).
+    """
+    if startup:
+        startup.mark("imports")
+    # Only the subsystems the game uses: no audio, joystick or timer subsystem start-up
+    pygame.display.init()
+    pygame.font.init()
+    # screen is always the WIDTH x HEIGHT logical frame; display presents it
+    if render_mode == "vsync":
+        # SDL only honours vsync for renderer-backed windows
+        try:
+            screen, display = open_display((WIDTH, HEIGHT), scale, scale_filter, vsync=True, fullscreen=fullscreen)
+        except pygame.error:
+            render_mode = "uncapped"
+            screen, display = open_display((WIDTH, HEIGHT), scale, scale_filter, fullscreen=fullscreen)
+    else:
+        screen, display = open_display((WIDTH, HEIGHT), scale, scale_filter, fullscreen=fullscreen)
+    frame_cap = FPS if render_mode == "throttled" else 0
     pygame.display.set_caption("Catch the Falling Fruit — Full Arcade")
     clock = pygame.time.Clock()
+    if startup:
+        startup.mark("display")
 
-    # Neon palette
-    BLACK = (6, 6, 10)
-    NEON_PINK = (255, 64, 200)
-    NEON_BLUE = (48, 200, 255)
-    NEON_GREEN = (120, 255, 120)
-    NEON_YELLOW = (255, 225, 60)
-    NEON_ORANGE = (255, 140, 0)
-    RED = (255, 60, 60)
-    GRAY = (120, 120, 120)
-    WHITE = (255, 255, 255)
-    PURPLE = (160, 64, 240)
-
-    # Fonts
-    big_font = pygame.font.SysFont("Arial", 56, bold=True)
-    med_font = pygame.font.SysFont("Arial", 28, bold=True)
-    small_font = pygame.font.SysFont("Arial", 18, bold=True)
-
-    # Player state (rect paddle)
-    player = {"x": WIDTH // 2 - 30, "y": HEIGHT - 90, "w": 60, "h": 44,
-              "vel": 0.0, "accel": 0.7, "max_speed": 9.0, "friction": 0.86,
-              "base_w": 60, "base_h": 44}
-
-    # Fruit types (shape-based)
-    fruit_types = [
-        {"color": NEON_PINK, "points": 1, "speed": 4.2, "size": 18},    # small apple
-        {"color": NEON_YELLOW, "points": 2, "speed": 5.0, "size": 24},  # banana-like
-        {"color": NEON_ORANGE, "points": 3, "speed": 6.0, "size": 28},  # orange-ish
-        {"color": NEON_BLUE, "points": 5, "speed": 4.8, "size": 22, "power": "slow"},  # slow-power
-        {"color": GRAY, "points": -1, "speed": 5.0, "size": 20, "power": "bomb"}       # bomb hazard
-    ]
-
-    # Save base speeds for reset
-    for f in fruit_types:
-        f["base_speed"] = f["speed"]
-
-    # Initial fruit
-    fruit = spawn_fruit(WIDTH, fruit_types)
-
-    # Mystery orb
-    mystery = None
-    last_mystery = pygame.time.get_ticks()
-
-    # Laser
-    laser = None
-    last_laser = pygame.time.get_ticks()
-
-    # Background neon lines (parallax)
-    bg_lines = []
-    for i in range(24):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        length = random.randint(60, 180)
-        speed = random.uniform(0.15, 0.6)
-        color = NEON_BLUE if random.random() < 0.5 else NEON_PINK
-        bg_lines.append([x, y, length, speed, color])
-
-    # Game state variables
-    score = 0
-    lives = 3
-    level = 1
-    slow_mode = False
-    slow_start = 0
-    high_score = load_high_score(HIGH_SCORE_FILE)
-
-    # Combo system
-    combo = 0
-    combo_timer = 0  # reset if miss or after some time
-    COMBO_RESET_MS = 1800
-
-    # Power bar (fills when catching fruits). When full, press SPACE for super mode.
-    power_bar = 0.0
-    POWER_PER_CATCH = 12.0   # percent points
-    SUPER_ACTIVE = False
-    super_start = 0
-
-    # Mystery effect states
-    reverse_controls = False
-    reverse_until = 0
-    freeze_time = False
-    freeze_until = 0
-
-    # Score pop animation
-    pop_list = []  # each: {"x","y","text","start_time"}
-
-    # HUD flash
-    hud_flash = None  # {"color","timer"}
+    # Raw frame capture (attract loops, bug reports): a ring of frames in a mapped file
+    capturer = None
+    if capture:
+        try:
+            capturer = FrameCapture(capture, screen, capture_fps, capture_seconds)
+        except (OSError, CaptureError) as e:
+            pygame.quit()
+            raise SystemExit(f"cannot capture to {capture}: {e}")
+        print(f"capturing the last {capture_seconds:g} s at {capture_fps} fps to {capture} "
+              f"({capturer.size / 2**20:.0f} MB)")
+
+    # Fonts, opened straight from the file found by an earlier run (see fonts.py)
+    fonts = FontResolver()
+    big_font = fonts.font("Arial", 56, bold=True)
+    med_font = fonts.font("Arial", 28, bold=True)
+    small_font = fonts.font("Arial", 18, bold=True)
+    if startup:
+        startup.mark("fonts")
+
+    # Pre-rendered gradient backgrounds (one per screen state, built on first use)
+    backgrounds = BackgroundCache()
+
+    # Pre-baked glow sprites (paddle, HUD panel, halos, laser beam). None are needed for
+    # the menu, so they are built while it is showing, one per frame (see render_frame);
+    # anything used before that is built on first use.
+    glow = GlowAtlas()
+    warmups = [lambda: backgrounds.get("playing", screen.get_size()),
+               lambda: backgrounds.get("gameover", screen.get_size()),
+               lambda: glow.beam(WIDTH, 18, (255, 40, 40, 160)),
+               lambda: glow.warm_halos(22, 0.12, NEON_BLUE, 60),
+               lambda: glow.warm_halos(18, 0.18, NEON_YELLOW, 80)]
+    for c in (NEON_YELLOW, RED, NEON_GREEN, NEON_BLUE, PURPLE):
+        warmups.append(lambda c=c: glow.panel_glow(240, 78, c))
+    for w, h in ((60, 44), (int(60 * 0.6), int(44 * 0.6)), (int(60 * 1.25), int(44 * 1.25))):
+        warmups.append(lambda w=w, h=h: glow.paddle_glow(w, h, NEON_PINK))
+    warmups.reverse()   # popped from the end
+
+    # Game simulation (logic only; this function feeds it input and draws it).
+    # Each game gets its own seed so the recorded inputs replay it exactly.
+    seeds = random.Random(seed) if seed is not None else None
+
+    def new_game():
+        seed = seeds.getrandbits(63) if seeds else new_seed()
+        return GameState(random.Random(seed), storm=storm), Recorder(seed, storm)
+
+    game, recorder = new_game()
+
+    # Catch / bomb / laser-hit particles, fed from the simulation's per-tick events
+    particles = ParticleSystem() if ParticleSystem else None
+    if particles:
+        warmups.append(particles.prepare)   # the first menu frame's warm-up
+
+    # Effect detail (glow layers, parallax lines, halo pulses, particle and pop budgets)
+    governor = QualityGovernor(1000 / FPS, quality or ("high" if script else "auto"))
+
+    def apply_quality(tier):
+        text_cache.max_glow = tier.text_glow
+        if particles:
+            particles.budget = min(tier.particles, particles.capacity)
+
+    apply_quality(governor.tier)
+
+    # Dirty-rect presenter (optional): every draw call's rect goes through track()
+    dirty = DirtyRects(display) if dirty_rects else None
+    track = dirty.add if dirty else untracked
+
+    def paint_background(name):
+        if dirty:
+            dirty.begin(screen, backgrounds.get(name, screen.get_size()), name)
+        else:
+            backgrounds.draw(screen, name)
+
+    # High score for the menu; every write after this goes through the background worker
+    leaderboard = Leaderboard.open(LEADERBOARD_FILE, legacy_file=HIGH_SCORE_FILE)
+    high_score = leaderboard.best()
+    # an unusable database file leaves an in-memory board: say so on the menu
+    scores_lost = leaderboard.open_error
+    leaderboard.close()
+    persist = PersistenceWorker(LEADERBOARD_FILE)
+    fonts.save(persist)
+    if startup:
+        startup.mark("leaderboard")
+
+    # Live profiler: only called while switched on, so it costs nothing when off
+    profiler = None
+    overlay = None
+    if profile and timer is None:
+        profiler = timer = FrameProfiler(export_path=profile_out, writer=persist)
+        overlay = ProfilerOverlay(small_font)
+
+    # Background neon lines: pre-rendered strips at three depths, shared by menu and game
+    parallax = Parallax(seed=seed)
 
     # Title animation
     title_phase = 0.0
@@ -188,481 +233,462 @@ def run_game():
     # Game screens
     state = "menu"  # 'menu', 'playing', 'gameover'
 
-    # Helpers
-    def reset_game():
-        nonlocal fruit, mystery, laser, score, lives, level, slow_mode, slow_start
-        nonlocal combo, combo_timer, power_bar, SUPER_ACTIVE, super_start
-        nonlocal reverse_controls, reverse_until, freeze_time, freeze_until, pop_list, hud_flash
-        score = 0
-        lives = 3
-        level = 1
-        slow_mode = False
-        slow_start = 0
-        fruit = spawn_fruit(WIDTH, fruit_types)
-        mystery = None
-        laser = None
-        combo = 0
-        combo_timer = 0
-        power_bar = 0.0
-        SUPER_ACTIVE = False
-        super_start = 0
-        reverse_controls = False
-        reverse_until = 0
-        freeze_time = False
-        freeze_until = 0
-        pop_list = []
-        hud_flash = None
-        # reset speeds
-        for f in fruit_types:
-            f["speed"] = f["base_speed"]
-
-    # Utility to apply a mystery effect
-    def apply_mystery_effect(effect):
-        nonlocal score, hud_flash, reverse_controls, reverse_until, freeze_time, freeze_until, player
-        if effect == "double_points":
-            # temporarily double next point value via marking a pop
-            hud_flash = {"color": NEON_YELLOW, "timer": 0}
-            pop_list.append({"x": WIDTH/2, "y": HEIGHT/2, "text": "DOUBLE!", "start": pygame.time.get_ticks()})
-            # We implement double points by adding a short window where SUPER-like double applied
-            # Simpler: increase score immediately (bonus)
-            score += 5
-        elif effect == "reverse":
-            reverse_controls = True
-            reverse_until = pygame.time.get_ticks() + 5000
-            hud_flash = {"color": PURPLE, "timer": 0}
-            pop_list.append({"x": WIDTH/2, "y": HEIGHT/2, "text": "REVERSE!", "start": pygame.time.get_ticks()})
-        elif effect == "shrink":
-            # shrink player for challenge
-            player["w"] = int(player["base_w"] * 0.6)
-            player["h"] = int(player["base_h"] * 0.6)
-            # restore after 6s
-            pop_list.append({"x": WIDTH/2, "y": HEIGHT/2, "text": "SHRINK!", "start": pygame.time.get_ticks()})
-            pygame.time.set_timer(pygame.USEREVENT + 5, 6000, loops=1)
-        elif effect == "grow":
-            player["w"] = int(player["base_w"] * 1.25)
-            player["h"] = int(player["base_h"] * 1.25)
-            pop_list.append({"x": WIDTH/2, "y": HEIGHT/2, "text": "GROW!", "start": pygame.time.get_ticks()})
-            pygame.time.set_timer(pygame.USEREVENT + 6, 6000, loops=1)
-        elif effect == "freeze":
-            freeze_time = True
-            freeze_until = pygame.time.get_ticks() + FREEZE_DURATION
-            pop_list.append({"x": WIDTH/2, "y": HEIGHT/2, "text": "FREEZE!", "start": pygame.time.get_ticks()})
-            hud_flash = {"color": NEON_BLUE, "timer": 0}
-        elif effect == "bonus_points":
-            bonus = random.randint(3, 8)
-            score += bonus
-            pop_list.append({"x": WIDTH/2, "y": HEIGHT/2, "text": f"+{bonus}", "start": pygame.time.get_ticks()})
-            hud_flash = {"color": NEON_YELLOW, "timer": 0}
+    # Fixed-timestep bookkeeping: real time not yet simulated, and a SPACE press
+    # waiting for the next tick (a frame can run zero ticks on fast displays)
+    accumulator = 0.0
+    space_pending = False
+    paused = False
+
+    # ----------------------
+    # Playing-screen renderer (reads the GameState, never mutates it)
+    # ----------------------
+    def draw_playing(game, alpha=1.0, high_score=0, timer=None):
+        """Draw the state; alpha in [0, 1] interpolates moving things between the last two ticks."""
+        player = game.player
+        fruit = game.fruit
+        mystery = game.mystery
+        laser = game.laser
+        now = game.time_ms
+        px = lerp(player.prev_x, player.x, alpha)
+        fx = lerp(fruit.prev_x, fruit.x, alpha)
+        fy = lerp(fruit.prev_y, fruit.y, alpha)
+        tier = governor.tier
+
+        # Draw player with neon glow
+        if tier.paddle_glow:
+            g, (gx, gy) = glow.paddle_glow(player.w, player.h, NEON_PINK, tier.paddle_glow)
+            track(screen.blit(g, (int(px) + gx, int(player.y) + gy), special_flags=pygame.BLEND_PREMULTIPLIED))
+        track(pygame.draw.rect(screen, NEON_PINK, (int(px), int(player.y), player.w, player.h), border_radius=6))
+        track(pygame.draw.rect(screen, WHITE, (int(px)+8, int(player.y)+12, player.w-16, player.h-24), 2, border_radius=4))
+
+        # Draw fruit with shapes
+        if game.storm is not None:
+            draw_storm(game.storm, game.fruit_types, alpha)
+        elif fruit.power == "bomb":
+            track(pygame.draw.circle(screen, GRAY, (int(fx), int(fy)), fruit.size))
+            track(pygame.draw.line(screen, RED, (fx-fruit.size, fy-fruit.size),
+                                   (fx+fruit.size, fy+fruit.size), 4))
+            track(pygame.draw.line(screen, RED, (fx+fruit.size, fy-fruit.size),
+                                   (fx-fruit.size, fy+fruit.size), 4))
+        elif fruit.power == "slow":
+            pulse = 1.0 + 0.12 * sin(ticks_ms() / 140.0) if tier.halo_pulse else 1.0
+            r = int(fruit.size * pulse)
+            glow_s = glow.halo(r, NEON_BLUE, 60)
+            track(screen.blit(glow_s, (int(fx - r*2), int(fy - r*2))))
+            track(pygame.draw.circle(screen, NEON_BLUE, (int(fx), int(fy)), r))
+            track(pygame.draw.circle(screen, WHITE, (int(fx), int(fy)), max(3, r-6), 2))
+        else:
+            track(pygame.draw.circle(screen, fruit.color, (int(fx), int(fy)), fruit.size))
+            track(pygame.draw.ellipse(screen, WHITE, (fx - fruit.size // 2, fy - fruit.size // 1.6,
+                                                     fruit.size//2, fruit.size//3)))
+
+        # Draw mystery orb if exists (neon star-like)
+        if mystery:
+            msize = mystery.size
+            mx = lerp(mystery.prev_x, mystery.x, alpha)
+            my = lerp(mystery.prev_y, mystery.y, alpha)
+            # pulsing glow
+            pulse = 1.0 + 0.18 * sin(ticks_ms() / 180.0) if tier.halo_pulse else 1.0
+            r = int(msize * pulse)
+            halo = glow.halo(r, NEON_YELLOW, 80)
+            track(screen.blit(halo, (int(mx - r*2), int(my - r*2))))
+            track(pygame.draw.circle(screen, NEON_YELLOW, (int(mx), int(my)), r))
+            track(pygame.draw.circle(screen, WHITE, (int(mx), int(my)), max(3, r-6), 2))
+
+        # Draw laser beam (if active)
+        if laser:
+            # neon horizontal beam with glow
+            y = laser.y
+            beam_surf = glow.beam(WIDTH, 18, (255, 40, 40, 160))
+            track(screen.blit(beam_surf, (0, y - 9)))
+            # thin bright center
+            track(pygame.draw.line(screen, RED, (0, y), (WIDTH, y), 3))
+        if timer:
+            timer.mark("sprites")
+
+        if particles:
+            rects = particles.draw(screen, dirty is not None)
+            if dirty:
+                dirty.extend(rects)
+            if timer:
+                timer.mark("particles")
+
+        # HUD drawing (score, lives, level, power bar, combo)
+        hud_x = 12
+        hud_y = 12
+        # HUD glow base
+        if game.hud_flash:
+            glow_color = game.hud_flash.color
+        else:
+            glow_color = NEON_YELLOW
+        if tier.panel_glow:
+            gsurf, (gx, gy) = glow.panel_glow(240, 78, glow_color, tier.panel_glow)
+            track(screen.blit(gsurf, (hud_x + gx, hud_y + gy), special_flags=pygame.BLEND_PREMULTIPLIED))
+        # HUD container
+        hud_rect = pygame.Rect(hud_x, hud_y, 240, 78)
+        track(pygame.draw.rect(screen, (12, 12, 18, 220), hud_rect, border_radius=8))
+        # Score and lives
+        track(neon_text(screen, f"Score: {game.score}", med_font, (hud_x + 90, hud_y + 22), WHITE, NEON_PINK, glow_strength=2))
+        track(neon_text(screen, f"Lives: {game.lives}", small_font, (hud_x + 90, hud_y + 52), WHITE, NEON_GREEN, glow_strength=1))
+        track(neon_text(screen, f"Level: {game.level}", small_font, (WIDTH - 80, 26), WHITE, NEON_YELLOW, glow_strength=2))
+        track(neon_text(screen, f"High: {high_score}", small_font, (WIDTH - 80, 52), WHITE, NEON_YELLOW, glow_strength=1))
+
+        # power bar drawn on HUD
+        bar_x, bar_y = WIDTH - 180, 84
+        track(pygame.draw.rect(screen, (8, 8, 12, 220), (bar_x, bar_y - 10, 148, 12), border_radius=6))
+        # fill percent
+        track(pygame.draw.rect(screen, NEON_BLUE, (bar_x + 4, bar_y - 8, int((game.power_bar/100.0) * 140), 8), border_radius=4))
+        track(neon_text(screen, "POWER", small_font, (bar_x + 70, bar_y + 4), WHITE, NEON_BLUE, glow_strength=1))
+        # combo display
+        if game.combo >= 2:
+            track(neon_text(screen, f"Combo x{1 + (game.combo//5)*0.5:.1f}", small_font, (WIDTH//2, 44), WHITE, NEON_PINK, glow_strength=2))
+
+        # Super indicator
+        if game.super_active:
+            track(neon_text(screen, "SUPER!", med_font, (WIDTH//2, 84), NEON_YELLOW, NEON_YELLOW, glow_strength=3))
+        if timer:
+            timer.mark("hud")
+
+        # Draw floating score pops (the newest ones, up to the tier's budget)
+        pops = game.pops
+        if tier.pops is not None and len(pops) > tier.pops:
+            pops = pops[-tier.pops:]
+        for pop in pops:
+            elapsed = now - pop.start
+            alpha = clamp(255 - int(255 * (elapsed / SCORE_POP_LIFETIME)), 0, 255)
+            surf = text_cache.text(med_font, pop.text, NEON_GREEN)
+            surf.set_alpha(alpha)
+            track(screen.blit(surf, (int(pop.x - surf.get_width() // 2), int(pop.y - surf.get_height() // 2))))
+        if timer:
+            timer.mark("pops")
+
+    def draw_storm(store, fruit_types, alpha):
+        # one pre-baked sprite per fruit type, blitted in a single batch
+        sprites = [glow.fruit(f.size, f.color, f.power) for f in fruit_types]
+        n = store.count
+        xs = (store.prev_x[:n] + (store.x[:n] - store.prev_x[:n]) * alpha).astype(int).tolist()
+        ys = (store.prev_y[:n] + (store.y[:n] - store.prev_y[:n]) * alpha).astype(int).tolist()
+        kinds = store.kind[:n].tolist()
+        sizes = [f.size * 2 for f in fruit_types]
+        rects = screen.blits([(sprites[k], (x - sizes[k], y - sizes[k])) for x, y, k in zip(xs, ys, kinds)],
+                             dirty is not None)
+        if dirty:
+            dirty.extend(rects)
+
+    # ----------------------
+    # Frame renderer: draws and presents one Frame (see pipeline.py). Called inline,
+    # or on the render thread with pipeline enabled; frame.game is then a snapshot.
+    # ----------------------
+    shown_game = None   # game_id whose particles are on screen
+    last_start = None   # perf_counter() at the start of the previous frame
+
+    def draw_parallax(frame_scale, speed):
+        rects = parallax.draw(screen, frame_scale, speed, governor.tier.parallax, dirty is not None)
+        if dirty:
+            dirty.extend(rects)
+
+    def render_frame(frame, timer=None):
+        nonlocal title_phase, shown_game, last_start
+        started = time.perf_counter()
+        warmed = False
+        # background animation was tuned per 60 Hz frame
+        frame_scale = frame.dt * 60
+        game = frame.game
+        if capturer:
+            # the last captured frame may still be copying out of the screen
+            capturer.wait()
+        if particles and frame.game_id != shown_game:
+            particles.clear()
+            shown_game = frame.game_id
+
+        # ----------------------
+        # STATE: MENU
+        # ----------------------
+        if frame.screen == "menu":
+            title_phase += frame.dt * 2.4
+            if warmups and last_start is not None:
+                # the menu has time to spare: build one sprite the game will need
+                warmups.pop()()
+                warmed = True
+            # Draw gradient background
+            paint_background("menu")
+            if timer:
+                timer.mark("background")
+
+            # Animated neon bars
+            draw_parallax(frame_scale, 0.85)
+            if timer:
+                timer.mark("bg_lines")
+
+            track(neon_text(screen, "CATCH THE FRUIT", big_font, (WIDTH // 2, HEIGHT // 2 - 90), WHITE, NEON_PINK, glow_strength=4))
+            track(neon_text(screen, "Press any key to start", med_font, (WIDTH // 2, HEIGHT // 2 + 10), NEON_BLUE, NEON_BLUE, glow_strength=2))
+            track(neon_text(screen, f"High Score: {frame.high_score}", small_font, (WIDTH // 2, HEIGHT // 2 + 60), NEON_YELLOW, NEON_YELLOW, glow_strength=1))
+            if scores_lost:
+                track(neon_text(screen, "Scores are not being saved", small_font, (WIDTH // 2, HEIGHT - 40), WHITE, NEON_PINK, glow_strength=1))
+            if timer:
+                timer.mark("hud")
+
+        # ----------------------
+        # STATE: PLAYING
+        # ----------------------
+        elif frame.screen == "playing":
+            # Background subtle gradient
+            paint_background("playing")
+            if timer:
+                timer.mark("background")
+
+            # Scroll the parallax background
+            draw_parallax(frame_scale, 1.0)
+            if timer:
+                timer.mark("bg_lines")
+
+            if particles:
+                for kind, x, y, color in frame.events:
+                    particles.emit(kind, x, y, color)
+                if not frame.paused:
+                    particles.update(frame.dt)
+            draw_playing(game, frame.alpha, frame.high_score, timer)
+            if frame.paused:
+                track(neon_text(screen, "PAUSED", big_font, (WIDTH // 2, HEIGHT // 2), WHITE, NEON_BLUE, glow_strength=4))
+
+        # ----------------------
+        # STATE: GAMEOVER
+        # ----------------------
+        else:
+            # stylized game over display
+            time_ms = ticks_ms()
+            paint_background("gameover")
+            if timer:
+                timer.mark("background")
+            # neon bars
+            for i in range(4 * governor.tier.parallax):
+                offset = (time_ms / 4 + i * 45) % (WIDTH + 200) - 100
+                color = NEON_PINK if i % 2 == 0 else NEON_BLUE
+                track(pygame.draw.rect(screen, color, (offset, HEIGHT//2 + i*6 - 160, 80, 3)))
+            if timer:
+                timer.mark("bg_lines")
+
+            track(neon_text(screen, "GAME OVER", big_font, (WIDTH // 2, HEIGHT // 2 - 60), WHITE, NEON_PINK, glow_strength=5))
+            track(neon_text(screen, f"Score: {game.score}", med_font, (WIDTH // 2, HEIGHT // 2 + 10), NEON_YELLOW, NEON_YELLOW, glow_strength=3))
+            track(neon_text(screen, f"High Score: {frame.high_score}", small_font, (WIDTH // 2, HEIGHT // 2 + 64), WHITE, NEON_YELLOW, glow_strength=2))
+            track(neon_text(screen, "Press any key to play again", small_font, (WIDTH // 2, HEIGHT // 2 + 120), NEON_BLUE, NEON_BLUE, glow_strength=2))
+            if timer:
+                timer.mark("hud")
+
+        if frame.overlay:
+            track(overlay.draw(screen, profiler, governor.summary()))
+            if timer:
+                timer.mark("overlay")
+        if capturer:
+            capturer.frame(screen, frame.dt)
+            if timer:
+                timer.mark("capture")
+        work_ms = (time.perf_counter() - started) * 1000
+
+        # Flip the display (or push just the changed rects)
+        if dirty:
+            dirty.present()
+        else:
+            display.flip()
+        if timer:
+            timer.mark("flip")
+
+        # frames that built a sprite are not typical of the tier
+        if last_start is not None and not warmed and governor.frame((started - last_start) * 1000, work_ms):
+            apply_quality(governor.tier)
+        last_start = started
+
+    # Optional render thread: this thread keeps events and the simulation
+    renderer = None
+    if pipeline:
+        renderer = RenderThread(render_frame, SnapshotBuffer(drop=pipeline == "latest", merge=merge_frames))
+        # the render thread is paced by the display; the simulation by the clock
+        frame_cap = frame_cap or FPS
 
     # ----------------------
     # Main loop
     # ----------------------
+    frame_index = 0
+    game_id = 0
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        now = pygame.time.get_ticks()
+        if script:
+            dt = script.dt
+            held = script.frame(frame_index, state, game)
+            if held is None:
+                if renderer:
+                    renderer.stop()
+                if capturer:
+                    capturer.close()
+                if profiler is not None and profile_out:
+                    profiler.export()
+                persist.close()
+                return high_score
+            frame_index += 1
+        else:
+            # the first frame does not wait out a frame period since the clock was made
+            dt = min(clock.tick(frame_cap if frame_index else 0) / 1000.0, MAX_FRAME_TIME)
+            frame_index += 1
+        if renderer:
+            renderer.check()
+        if timer:
+            timer.begin_frame()
         # Event handling
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                save_high_score(HIGH_SCORE_FILE, high_score)
+                if renderer:
+                    # finish the frames in flight before the display goes away
+                    renderer.stop()
+                if capturer:
+                    capturer.close()
+                if profiler is not None and timer is profiler and profile_out:
+                    profiler.export()
+                if state == "playing" and game.score > 0:
+                    # an abandoned game still counts
+                    persist.record_run(game.score, game.level, game.time_ms)
                 pygame.quit()
+                persist.close()
                 sys.exit()
-            # Timed events for restoring player size
-            if event.type == pygame.USEREVENT + 5:
-                # restore from shrink
-                player["w"] = player["base_w"]
-                player["h"] = player["base_h"]
-            if event.type == pygame.USEREVENT + 6:
-                # restore from grow
-                player["w"] = player["base_w"]
-                player["h"] = player["base_h"]
+            if event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+                if timer is None:
+                    if profiler is None:
+                        profiler = FrameProfiler(export_path=profile_out, writer=persist)
+                        overlay = ProfilerOverlay(small_font)
+                    timer = profiler
+                    timer.begin_frame()
+                elif timer is profiler:
+                    if profile_out:
+                        profiler.export()
+                    timer = None
+                continue
             if event.type == pygame.KEYDOWN:
-                if state == "menu":
-                    reset_game()
-                    state = "playing"
-                elif state == "gameover":
-                    reset_game()
+                if state == "menu" or state == "gameover":
+                    game, recorder = new_game()
+                    game_id += 1
+                    accumulator = 0.0
                     state = "playing"
                 elif state == "playing":
-                    if event.key == pygame.K_SPACE:
-                        # activate super if bar full
-                        if power_bar >= 100 and not SUPER_ACTIVE:
-                            SUPER_ACTIVE = True
-                            super_start = pygame.time.get_ticks()
-                            power_bar = 0.0
-                            hud_flash = {"color": NEON_YELLOW, "timer": 0}
+                    if event.key == PAUSE_KEY:
+                        paused = not paused
+                    elif event.key == pygame.K_SPACE and not paused:
+                        # activate super if bar full (checked by the simulation)
+                        space_pending = True
             # No other special events
 
         keys = pygame.key.get_pressed()
+        screen_state = state
+        if timer:
+            timer.mark("events")
 
         # ----------------------
-        # STATE: MENU
-        # ----------------------
-        if state == "menu":
-            title_phase += dt * 2.4
-            # Draw gradient background
-            for y in range(HEIGHT):
-                t = y / HEIGHT
-                r = int(8 * (1 - t) + 28 * t)
-                g = int(6 * (1 - t) + 20 * t)
-                b = int(20 * (1 - t) + 40 * t)
-                pygame.draw.line(screen, (r, g, b), (0, y), (WIDTH, y))
-
-            # Animated neon bars
-            for i, line in enumerate(bg_lines):
-                line[1] += line[3]
-                if line[1] > HEIGHT + line[2]:
-                    line[0] = random.randint(-80, WIDTH)
-                    line[1] = -random.randint(20, 160)
-                    line[2] = random.randint(60, 180)
-                    line[3] = random.uniform(0.15, 0.6)
-                    line[4] = NEON_BLUE if random.random() < 0.5 else NEON_PINK
-                lx, ly, length, _, color = line
-                pygame.draw.line(screen, color, (lx, ly), (lx, ly + length), 2)
-
-            neon_text(screen, "CATCH THE FRUIT", big_font, (WIDTH // 2, HEIGHT // 2 - 90), WHITE, NEON_PINK, glow_strength=4)
-            neon_text(screen, "Press any key to start", med_font, (WIDTH // 2, HEIGHT // 2 + 10), NEON_BLUE, NEON_BLUE, glow_strength=2)
-            neon_text(screen, f"High Score: {high_score}", small_font, (WIDTH // 2, HEIGHT // 2 + 60), NEON_YELLOW, NEON_YELLOW, glow_strength=1)
-            pygame.display.flip()
-            continue
-
-        # ----------------------
-        # STATE: PLAYING
+        # Simulation: as many fixed ticks as real time has accumulated
         # ----------------------
+        frame_events = []
         if state == "playing":
-            # Background subtle gradient
-            for y in range(HEIGHT):
-                t = y / HEIGHT
-                r = int(6*(1 - t) + 18*t)
-                g = int(8*(1 - t) + 18*t)
-                b = int(20*(1 - t) + 36*t)
-                pygame.draw.line(screen, (r, g, b), (0, y), (WIDTH, y))
-
-            # Update bg lines
-            for i, line in enumerate(bg_lines):
-                line[1] += line[3]
-                if line[1] > HEIGHT + line[2]:
-                    line[0] = random.randint(-80, WIDTH)
-                    line[1] = -random.randint(20, 160)
-                    line[2] = random.randint(60, 180)
-                    line[3] = random.uniform(0.2, 0.7)
-                    line[4] = NEON_BLUE if random.random() < 0.5 else NEON_PINK
-                lx, ly, length, _, color = line
-                pygame.draw.line(screen, color, (lx, ly), (lx, ly + length), 2)
-
-            # Update lasers (spawn periodically)
-            if not laser and now - last_laser > LASER_INTERVAL:
-                laser = spawn_laser()
-                last_laser = now
-            if laser:
-                if now - laser["start"] > LASER_DURATION:
-                    laser = None
-
-            # Update mystery orb spawns
-            if not mystery and now - last_mystery > MYSTERY_INTERVAL:
-                mystery = spawn_mystery(WIDTH)
-                last_mystery = now
-
-            # Movement input (account for reverse_controls)
-            left_pressed = keys[pygame.K_LEFT]
-            right_pressed = keys[pygame.K_RIGHT]
-            if reverse_controls:
-                left_pressed, right_pressed = right_pressed, left_pressed
-
-            if left_pressed:
-                player["vel"] -= player["accel"]
-            elif right_pressed:
-                player["vel"] += player["accel"]
+            inputs = 0
+            if script:
+                inputs = held & (INPUT_LEFT | INPUT_RIGHT)
             else:
-                player["vel"] *= player["friction"]
-
-            # clamp velocity
-            player["vel"] = clamp(player["vel"], -player["max_speed"], player["max_speed"])
-            player["x"] += player["vel"]
-            # bounds
-            if player["x"] < 6:
-                player["x"] = 6
-                player["vel"] = 0
-            if player["x"] > WIDTH - player["w"] - 6:
-                player["x"] = WIDTH - player["w"] - 6
-                player["vel"] = 0
-
-            # Freeze time effect stops fruit/laser/mystery movement
-            time_frozen = freeze_time and now < freeze_until
-
-            # Fruit physics
-            if not time_frozen:
-                speed_mod = 0.55 if slow_mode else 1.0
-                fruit["wobble"] += 0.06
-                fruit["x"] += sin(fruit["wobble"]) * 0.6
-                fruit["y"] += fruit["speed"] * speed_mod
-
-            # Mystery physics
-            if mystery and not time_frozen:
-                mystery["wobble"] += 0.06
-                mystery["x"] += sin(mystery["wobble"]) * 0.6
-                mystery["y"] += mystery["speed"]
-
-            # Laser collision check (if active)
-            if laser and not time_frozen:
-                # Laser represented as a thick horizontal beam; touching it costs a life
-                laser_rect = pygame.Rect(0, laser["y"] - 8, WIDTH, 16)
-                player_rect = pygame.Rect(int(player["x"]), int(player["y"]), player["w"], player["h"])
-                if player_rect.colliderect(laser_rect):
-                    # hit laser: lose a life and flash HUD
-                    lives -= 1
-                    hud_flash = {"color": RED, "timer": 0}
-                    # remove laser to avoid multiple hits
-                    laser = None
-
-            # Collision detection with fruit
-            player_rect = pygame.Rect(int(player["x"]), int(player["y"]), player["w"], player["h"])
-            fruit_rect = pygame.Rect(int(fruit["x"] - fruit["size"]), int(fruit["y"] - fruit["size"]),
-                                     fruit["size"] * 2, fruit["size"] * 2)
-            collided = False
-            if player_rect.colliderect(fruit_rect):
-                collided = True
-                # handle power types
-                if fruit.get("power") == "slow":
-                    slow_mode = True
-                    slow_start = now
-                    hud_flash = {"color": NEON_BLUE, "timer": 0}
-                elif fruit.get("power") == "bomb":
-                    # bomb subtracts a life
-                    lives -= 1
-                    hud_flash = {"color": RED, "timer": 0}
-                    # negative points penalty optional
+                if keys[pygame.K_LEFT]:
+                    inputs |= INPUT_LEFT
+                if keys[pygame.K_RIGHT]:
+                    inputs |= INPUT_RIGHT
+            if not paused:
+                accumulator += dt
+            ticks = 0
+            while accumulator >= TICK_DT and ticks < MAX_TICKS_PER_FRAME and not game.over:
+                tick_inputs = inputs | (INPUT_SPACE if space_pending else 0)
+                recorder.record(tick_inputs)
+                if timer:
+                    # same as step(), timed in its two halves
+                    integrate(game, tick_inputs, TICK_DT)
+                    timer.mark("physics")
+                    resolve(game, TICK_DT)
+                    timer.mark("collision")
                 else:
-                    # normal fruit: calculate points with combo and super
-                    base_points = fruit.get("points", 1)
-                    # increment combo
-                    combo += 1
-                    combo_timer = now
-                    # calculate multiplier from combo
-                    multiplier = 1 + (combo // 5) * 0.5  # +0.5 every 5 chain
-                    if SUPER_ACTIVE:
-                        multiplier *= 2.0
-                    pts = int(base_points * multiplier)
-                    score += pts
-                    pop_list.append({"x": fruit["x"], "y": fruit["y"] - 6, "text": f"+{pts}", "start": now})
-                    hud_flash = {"color": NEON_GREEN, "timer": 0}
-                    # power bar fill
-                    power_bar = clamp(power_bar + POWER_PER_CATCH, 0.0, 100.0)
-
-                # Respawn fruit
-                fruit = spawn_fruit(WIDTH, fruit_types)
-
-                # Level scaling every 10 points
-                new_level = score // 10 + 1
-                if new_level > level:
-                    level = new_level
-                    for ft in fruit_types:
-                        ft["speed"] += 0.45
-
-            # If fruit missed (falls beyond bottom)
-            if fruit["y"] > HEIGHT + fruit["size"]:
-                lives -= 1
-                hud_flash = {"color": RED, "timer": 0}
-                fruit = spawn_fruit(WIDTH, fruit_types)
-                # reset combo on miss
-                combo = 0
-                combo_timer = 0
-
-            # Mystery collision
-            if mystery:
-                mystery_rect = pygame.Rect(int(mystery["x"] - mystery["size"]), int(mystery["y"] - mystery["size"]),
-                                           mystery["size"] * 2, mystery["size"] * 2)
-                if player_rect.colliderect(mystery_rect):
-                    # pick random effect
-                    effects = ["double_points", "reverse", "shrink", "grow", "freeze", "bonus_points"]
-                    effect = random.choice(effects)
-                    apply_mystery_effect(effect)
-                    mystery = None
-
-                # if missed -> disappear
-                if mystery and mystery["y"] > HEIGHT + mystery["size"]:
-                    mystery = None
-
-            # Super mode expiration
-            if SUPER_ACTIVE and now - super_start > SUPER_DURATION:
-                SUPER_ACTIVE = False
-
-            # slow mode expiration
-            if slow_mode and now - slow_start > 3500:
-                slow_mode = False
-
-            # reverse controls expiration
-            if reverse_controls and now > reverse_until:
-                reverse_controls = False
-
-            # freeze expiration
-            if freeze_time and now > freeze_until:
-                freeze_time = False
-
-            # Combo timeout
-            if combo > 0 and now - combo_timer > COMBO_RESET_MS:
-                combo = 0
-
-            # HUD flash timer
-            if hud_flash:
-                hud_flash["timer"] += 1
-                if hud_flash["timer"] > 18:
-                    hud_flash = None
-
-            # Score pop animations update: fade & rise
-            for pop in pop_list[:]:
-                elapsed = now - pop["start"]
-                if elapsed > SCORE_POP_LIFETIME:
-                    pop_list.remove(pop)
-                else:
-                    pop["y"] -= 30 * dt  # float upward
-
-            # Laser lifetime removal handled earlier
-
-            # Spawn new mystery item periodically handled earlier
-
-            # Draw player with neon glow
-            for i in range(4, 0, -1):
-                glow_rect = pygame.Rect(int(player["x"] - i*2), int(player["y"] - i*1.2),
-                                        player["w"] + i*4, player["h"] + i*2)
-                g = pygame.Surface((glow_rect.w, glow_rect.h), pygame.SRCALPHA)
-                alpha = int(28 / i)
-                g.fill((NEON_PINK[0], NEON_PINK[1], NEON_PINK[2], max(0, alpha)))
-                screen.blit(g, (glow_rect.x, glow_rect.y))
-            pygame.draw.rect(screen, NEON_PINK, (int(player["x"]), int(player["y"]), player["w"], player["h"]), border_radius=6)
-            pygame.draw.rect(screen, WHITE, (int(player["x"])+8, int(player["y"])+12, player["w"]-16, player["h"]-24), 2, border_radius=4)
-
-            # Draw fruit with shapes
-            if fruit.get("power") == "bomb":
-                pygame.draw.circle(screen, GRAY, (int(fruit["x"]), int(fruit["y"])), fruit["size"])
-                pygame.draw.line(screen, RED, (fruit["x"]-fruit["size"], fruit["y"]-fruit["size"]),
-                                 (fruit["x"]+fruit["size"], fruit["y"]+fruit["size"]), 4)
-                pygame.draw.line(screen, RED, (fruit["x"]+fruit["size"], fruit["y"]-fruit["size"]),
-                                 (fruit["x"]-fruit["size"], fruit["y"]+fruit["size"]), 4)
-            elif fruit.get("power") == "slow":
-                pulse = 1.0 + 0.12 * sin(pygame.time.get_ticks() / 140.0)
-                r = int(fruit["size"] * pulse)
-                glow_s = pygame.Surface((r*4, r*4), pygame.SRCALPHA)
-                pygame.draw.circle(glow_s, (NEON_BLUE[0], NEON_BLUE[1], NEON_BLUE[2], 60),
-                                   (r*2, r*2), int(r*1.8))
-                screen.blit(glow_s, (int(fruit["x"] - r*2), int(fruit["y"] - r*2)))
-                pygame.draw.circle(screen, NEON_BLUE, (int(fruit["x"]), int(fruit["y"])), r)
-                pygame.draw.circle(screen, WHITE, (int(fruit["x"]), int(fruit["y"])), max(3, r-6), 2)
-            else:
-                pygame.draw.circle(screen, fruit["color"], (int(fruit["x"]), int(fruit["y"])), fruit["size"])
-                pygame.draw.ellipse(screen, WHITE, (fruit["x"] - fruit["size"] // 2, fruit["y"] - fruit["size"] // 1.6,
-                                                   fruit["size"]//2, fruit["size"]//3))
-
-            # Draw mystery orb if exists (neon star-like)
-            if mystery:
-                msize = mystery["size"]
-                # pulsing glow
-                pulse = 1.0 + 0.18 * sin(pygame.time.get_ticks() / 180.0)
-                r = int(msize * pulse)
-                glow = pygame.Surface((r*4, r*4), pygame.SRCALPHA)
-                pygame.draw.circle(glow, (NEON_YELLOW[0], NEON_YELLOW[1], NEON_YELLOW[2], 80),
-                                   (r*2, r*2), int(r*1.8))
-                screen.blit(glow, (int(mystery["x"] - r*2), int(mystery["y"] - r*2)))
-                pygame.draw.circle(screen, NEON_YELLOW, (int(mystery["x"]), int(mystery["y"])), r)
-                pygame.draw.circle(screen, WHITE, (int(mystery["x"]), int(mystery["y"])), max(3, r-6), 2)
-
-            # Draw laser beam (if active)
-            if laser:
-                # neon horizontal beam with glow
-                y = laser["y"]
-                beam_surf = pygame.Surface((WIDTH, 18), pygame.SRCALPHA)
-                beam_surf.fill((255, 40, 40, 160))
-                screen.blit(beam_surf, (0, y - 9))
-                # thin bright center
-                pygame.draw.line(screen, RED, (0, y), (WIDTH, y), 3)
-
-            # HUD drawing (score, lives, level, power bar, combo)
-            hud_x = 12
-            hud_y = 12
-            # HUD glow base
-            if hud_flash:
-                glow_color = hud_flash["color"]
-            else:
-                glow_color = NEON_YELLOW
-            for i in range(6, 0, -1):
-                alpha = 14 - i*2
-                rect = pygame.Rect(-i*2 + hud_x, -i + hud_y, 240 + i*4, 78 + i*2)
-                gsurf = pygame.Surface((rect.w, rect.h), pygame.SRCALPHA)
-                gsurf.fill((glow_color[0], glow_color[1], glow_color[2], max(0, alpha)))
-                screen.blit(gsurf, (rect.x, rect.y))
-            # HUD container
-            hud_rect = pygame.Rect(hud_x, hud_y, 240, 78)
-            pygame.draw.rect(screen, (12, 12, 18, 220), hud_rect, border_radius=8)
-            # Score and lives
-            neon_text(screen, f"Score: {score}", med_font, (hud_x + 90, hud_y + 22), WHITE, NEON_PINK, glow_strength=2)
-            neon_text(screen, f"Lives: {lives}", small_font, (hud_x + 90, hud_y + 52), WHITE, NEON_GREEN, glow_strength=1)
-            neon_text(screen, f"Level: {level}", small_font, (WIDTH - 80, 26), WHITE, NEON_YELLOW, glow_strength=2)
-            neon_text(screen, f"High: {high_score}", small_font, (WIDTH - 80, 52), WHITE, NEON_YELLOW, glow_strength=1)
-
-            # power bar drawn on HUD
-            bar_x, bar_y = WIDTH - 180, 84
-            pygame.draw.rect(screen, (8, 8, 12, 220), (bar_x, bar_y - 10, 148, 12), border_radius=6)
-            # fill percent
-            pygame.draw.rect(screen, NEON_BLUE, (bar_x + 4, bar_y - 8, int((power_bar/100.0) * 140), 8), border_radius=4)
-            neon_text(screen, "POWER", small_font, (bar_x + 70, bar_y + 4), WHITE, NEON_BLUE, glow_strength=1)
-            # combo display
-            if combo >= 2:
-                neon_text(screen, f"Combo x{1 + (combo//5)*0.5:.1f}", small_font, (WIDTH//2, 44), WHITE, NEON_PINK, glow_strength=2)
-
-            # Super indicator
-            if SUPER_ACTIVE:
-                neon_text(screen, "SUPER!", med_font, (WIDTH//2, 84), NEON_YELLOW, NEON_YELLOW, glow_strength=3)
-
-            # Draw pop_list floating texts
-            for pop in pop_list:
-                elapsed = now - pop["start"]
-                alpha = clamp(255 - int(255 * (elapsed / SCORE_POP_LIFETIME)), 0, 255)
-                surf = med_font.render(pop["text"], True, NEON_GREEN)
-                surf.set_alpha(alpha)
-                screen.blit(surf, (int(pop["x"] - surf.get_width() // 2), int(pop["y"] - surf.get_height() // 2)))
+                    step(game, tick_inputs, TICK_DT)
+                if particles and game.events:
+                    frame_events.extend(game.events)
+                space_pending = False
+                accumulator -= TICK_DT
+                ticks += 1
+            if ticks == MAX_TICKS_PER_FRAME and accumulator >= TICK_DT:
+                # hopelessly behind: drop the debt rather than spiral
+                accumulator = 0.0
 
             # Update high score dynamically
-            if score > high_score:
-                high_score = score
+            if game.score > high_score:
+                high_score = game.score
 
             # End condition
-            if lives <= 0:
-                # save HS and go to gameover
-                save_high_score(HIGH_SCORE_FILE, high_score)
+            if game.over:
+                # queue the run and its replay for writing, go to gameover
+                persist.record_run(game.score, game.level, game.time_ms)
+                if REPLAY_DIR is not None:
+                    replay = recorder.finish(game)
+                    persist.save_file(replay_path(REPLAY_DIR, replay), replay.to_bytes())
                 state = "gameover"
 
-        # ----------------------
-        # STATE: GAMEOVER
-        # ----------------------
-        if state == "gameover":
-            # stylized game over display
-            time_ms = pygame.time.get_ticks()
-            for y in range(HEIGHT):
-                t = y / HEIGHT
-                r = int(4*(1 - t) + 16 * t)
-                g = int(6*(1 - t) + 12 * t)
-                b = int(10*(1 - t) + 28 * t)
-                pygame.draw.line(screen, (r, g, b), (0, y), (WIDTH, y))
-            # neon bars
-            for i in range(12):
-                offset = (time_ms / 4 + i * 45) % (WIDTH + 200) - 100
-                color = NEON_PINK if i % 2 == 0 else NEON_BLUE
-                pygame.draw.rect(screen, color, (offset, HEIGHT//2 + i*6 - 160, 80, 3))
-
-            neon_text(screen, "GAME OVER", big_font, (WIDTH // 2, HEIGHT // 2 - 60), WHITE, NEON_PINK, glow_strength=5)
-            neon_text(screen, f"Score: {score}", med_font, (WIDTH // 2, HEIGHT // 2 + 10), NEON_YELLOW, NEON_YELLOW, glow_strength=3)
-            neon_text(screen, f"High Score: {high_score}", small_font, (WIDTH // 2, HEIGHT // 2 + 64), WHITE, NEON_YELLOW, glow_strength=2)
-            neon_text(screen, "Press any key to play again", small_font, (WIDTH // 2, HEIGHT // 2 + 120), NEON_BLUE, NEON_BLUE, glow_strength=2)
-
-        # Flip the display
-        pygame.display.flip()
+        show_overlay = timer is not None and timer is profiler
+        if renderer:
+            renderer.buffer.publish(Frame(state, snapshot(game), accumulator / TICK_DT, dt, high_score, paused,
+                                          frame_events, game_id, show_overlay))
+            if timer:
+                timer.mark("snapshot")
+        else:
+            render_frame(Frame(state, game, accumulator / TICK_DT, dt, high_score, paused,
+                               frame_events, game_id, show_overlay), timer)
+        if timer:
+            timer.end_frame(screen_state)
+        if startup:
+            if renderer:
+                renderer.stop()
+            startup.mark("first frame")
+            if capturer:
+                capturer.close()
+            persist.close()
+            return high_score
 
     # end main loop
 
 # Entry point
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Catch the Falling Fruit")
+    parser.add_argument("--storm", type=int, default=0, metavar="N",
+                        help="fruit storm mode: N simultaneous fruits (needs NumPy)")
+    parser.add_argument("--render", choices=RENDER_MODES, default="throttled",
+                        help="render pacing (the simulation rate is fixed either way)")
+    parser.add_argument("--scale", choices=SCALE_MODES, default="native",
+                        help="how the 480x720 frame is upscaled to the screen")
+    parser.add_argument("--filter", choices=SCALE_FILTERS, default="integer",
+                        help="upscale filter: whole-pixel nearest neighbour or smooth")
+    parser.add_argument("--fullscreen", action="store_true")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw and present only the changed parts of the screen")
+    parser.add_argument("--profile", action="store_true",
+                        help="start with the profiler overlay on (F3 toggles it)")
+    parser.add_argument("--profile-out", metavar="FILE",
+                        help="export profiler stats here every few seconds (.csv or .json)")
+    parser.add_argument("--pipeline", nargs="?", const="latest", choices=PIPELINE_MODES,
+                        help="draw on a separate render thread (experimental, measured slower on one CPU; default mode: latest)")
+    parser.add_argument("--quality", choices=QUALITY_MODES, default="auto",
+                        help="effect detail: adapt to the frame rate, or a fixed tier")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print how long the first frame took to appear, then exit")
+    parser.add_argument("--capture", metavar="FILE",
+                        help="record the last seconds of play as raw frames (export: capture.py)")
+    parser.add_argument("--capture-fps", type=int, default=CAPTURE_FPS, metavar="N")
+    parser.add_argument("--capture-seconds", type=float, default=CAPTURE_SECONDS, metavar="S",
+                        help="length of the recording ring (480x720 frames take 1.4 MB each)")
+    args = parser.parse_args()
+    startup = StartupTimer(LAUNCHED) if args.startup_time else None
     try:
-        run_game()
+        run_game(storm=args.storm, render_mode=args.render, profile=args.profile, profile_out=args.profile_out,
+                 dirty_rects=args.dirty_rects, scale=args.scale, scale_filter=args.filter,
+                 fullscreen=args.fullscreen, pipeline=args.pipeline, quality=args.quality, startup=startup,
+                 capture=args.capture, capture_fps=args.capture_fps, capture_seconds=args.capture_seconds)
+        if startup:
+            print(startup.report())
     except Exception:
         traceback.print_exc()
         pygame.quit()
@@ -0,0 +1,74 @@
+import pygame
+
+# -------------------------
+# Dirty-rectangle presenter
+# -------------------------
+# Instead of repainting the whole background and flipping all 480x720 pixels, each frame
+# restores only the rects drawn on the previous frame (from the cached background
+# surface), redraws the moving things and pushes old + new rects with
+# display.update(rects). A change of screen, or the first frame, repaints and flips
+# everything once.
+
+MAX_RECTS = 160    # beyond this many rects (fruit storm), or
+FULL_AREA = 0.5    # this fraction of the screen (overlaps counted twice), one flip is cheaper
+
+
+class DirtyRects:
+    """Tracks what was drawn this frame and what must be erased on the next one."""
+
+    def __init__(self, display=None):
+        self.display = display or pygame.display   # anything with flip() and update(rects)
+        self.previous = []       # rects drawn last frame (erased at the start of this one)
+        self.current = []
+        self.screen = None
+        self.area = 0
+        self.full = True
+
+    def invalidate(self):
+        """Repaint and present the whole screen on the next frame."""
+        self.full = True
+
+    def begin(self, surface, background, screen):
+        """Erase last frame's drawing; screen names the background so a change repaints all."""
+        if screen != self.screen:
+            self.screen = screen
+            self.full = True
+        self.area = background.get_width() * background.get_height()
+        if self.full:
+            surface.blit(background, (0, 0))
+        else:
+            blit = surface.blit
+            for rect in self.previous:
+                blit(background, rect, rect)
+
+    def add(self, rect):
+        """Record a drawn rect (pass the Rect returned by blit / pygame.draw)."""
+        if rect:
+            self.current.append(rect)
+        return rect
+
+    def extend(self, rects):
+        """Record a batch of drawn rects (e.g. the list returned by Surface.blits)."""
+        self.current.extend(rects)
+
+    def present(self):
+        """Push this frame to the display; returns the number of rects updated (0 = full)."""
+        drawn = self.current
+        if self.full:
+            self.display.flip()
+            self.full = False
+            count = 0
+        else:
+            # Overlapping rects are passed as they are: SDL copies each one, which costs
+            # less than merging them in Python
+            rects = self.previous + drawn
+            if len(rects) > MAX_RECTS or sum(r.w * r.h for r in rects) > self.area * FULL_AREA:
+                self.display.flip()
+                count = 0
+            else:
+                self.display.update(rects)
+                count = len(rects)
+        self.previous = drawn
+        self.current = []
+        return count
+
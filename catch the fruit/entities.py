@@ -0,0 +1,181 @@
+from math import pi
+
+# -------------------------
+# Game entities
+# -------------------------
+# Small fixed-shape records for everything on the playfield. __slots__ classes instead
+# of dicts: attribute reads are plain slot lookups rather than string-keyed hashing,
+# each object is a fraction of a dict's size, and a typo is an AttributeError instead
+# of a silently created key. Short-lived entities (fruit, orbs, lasers, score pops,
+# HUD flashes) come from a per-game Pool and go back to it when they disappear, so
+# the tick loop reuses the same few objects instead of allocating new ones.
+
+MYSTERY_SIZE = 18
+MYSTERY_SPEED = 3.5
+
+
+class FruitKind:
+    """One row of the fruit table, resolved once per game (speed grows with the level)."""
+
+    __slots__ = ("color", "points", "speed", "size", "power")
+
+    def __init__(self, spec):
+        self.color = spec["color"]
+        self.points = spec["points"]
+        self.speed = spec["speed"]
+        self.size = spec["size"]
+        self.power = spec.get("power")   # None, "slow" or "bomb"
+
+
+def fruit_kinds(fruit_types):
+    """FruitKind per entry of a FRUIT_TYPES-style list of dicts."""
+    return [FruitKind(f) for f in fruit_types]
+
+
+class Player:
+    __slots__ = ("x", "y", "w", "h", "vel", "accel", "max_speed", "friction", "base_w", "base_h", "prev_x")
+
+    def __init__(self, x, y, w=60, h=44):
+        self.x = x
+        self.y = y
+        self.w = self.base_w = w
+        self.h = self.base_h = h
+        self.vel = 0.0
+        self.accel = 0.7
+        self.max_speed = 9.0
+        self.friction = 0.86
+        self.prev_x = x
+
+
+class Fruit:
+    __slots__ = ("x", "y", "prev_x", "prev_y", "size", "speed", "color", "points", "power", "wobble")
+
+    def reset(self, rng, width, kind):
+        """Respawn above the screen as a fruit of kind (same draws as the old spawn_fruit)."""
+        x = rng.randint(30, width - 30)
+        y = -rng.randint(20, 160)
+        self.x = self.prev_x = x    # prev_*: position at the start of the tick
+        self.y = self.prev_y = y
+        self.size = kind.size
+        self.speed = kind.speed
+        self.color = kind.color
+        self.points = kind.points
+        self.power = kind.power
+        self.wobble = rng.random() * 2 * pi
+        return self
+
+
+class Mystery:
+    __slots__ = ("x", "y", "prev_x", "prev_y", "size", "speed", "wobble")
+
+    def reset(self, rng, width):
+        x = rng.randint(40, width - 40)
+        y = -rng.randint(30, 200)
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+        self.size = MYSTERY_SIZE
+        self.speed = MYSTERY_SPEED
+        self.wobble = rng.random() * 2 * pi
+        return self
+
+
+class Laser:
+    """Horizontal beam across the playfield at height y, switched on at time start (ms)."""
+
+    __slots__ = ("y", "start")
+
+    def reset(self, y, start):
+        self.y = y
+        self.start = start
+        return self
+
+
+class Pop:
+    """Floating score text."""
+
+    __slots__ = ("x", "y", "text", "start")
+
+    def reset(self, x, y, text, start):
+        self.x = x
+        self.y = y
+        self.text = text
+        self.start = start
+        return self
+
+
+class Flash:
+    """HUD glow colour override (GameState.flash schedules its end)."""
+
+    __slots__ = ("color",)
+
+    def reset(self, color):
+        self.color = color
+        return self
+
+
+class Pool:
+    """Free list of released entities of one class; acquire() reuses them before allocating."""
+
+    __slots__ = ("cls", "free", "created")
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+
+    def acquire(self):
+        if self.free:
+            return self.free.pop()
+        self.created += 1
+        return self.cls()
+
+    def release(self, obj):
+        if obj is not None:
+            self.free.append(obj)
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import tracemalloc
+    from time import perf_counter
+    from simulation import FRUIT_TYPES, WIDTH
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    kinds = fruit_kinds(FRUIT_TYPES)
+
+    def spawn_dict(rng, f):
+        x = rng.randint(30, WIDTH - 30)
+        y = -rng.randint(20, 160)
+        return {"x": x, "y": y, "prev_x": x, "prev_y": y, "size": f["size"], "speed": f["speed"],
+                "color": f["color"], "points": f["points"], "power": f.get("power", None),
+                "wobble": rng.random() * 2 * pi}
+
+    rng = random.Random(0)
+    t0 = perf_counter()
+    for _ in range(n):
+        f = spawn_dict(rng, rng.choice(FRUIT_TYPES))
+        f["prev_y"] = f["y"]
+        f["y"] += f["speed"]
+    dict_us = (perf_counter() - t0) * 1e6 / n
+
+    rng = random.Random(0)
+    pool = Pool(Fruit)
+    t0 = perf_counter()
+    for _ in range(n):
+        f = pool.acquire().reset(rng, WIDTH, rng.choice(kinds))
+        f.prev_y = f.y
+        f.y += f.speed
+        pool.release(f)
+    slot_us = (perf_counter() - t0) * 1e6 / n
+
+    tracemalloc.start()
+    dicts = [spawn_dict(rng, FRUIT_TYPES[0]) for _ in range(10_000)]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del dicts
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    objs = [Fruit().reset(rng, WIDTH, kinds[0]) for _ in range(10_000)]
+    slot_bytes = tracemalloc.get_traced_memory()[0] - base
+    print(f"spawn + move: dict {dict_us:.2f} us, pooled slots {slot_us:.2f} us; "
+          f"memory per fruit: dict {dict_bytes / 10_000:.0f} B, slots {slot_bytes / len(objs):.0f} B")
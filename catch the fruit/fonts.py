@@ -0,0 +1,96 @@
+import json
+import os
+
+import pygame
+
+from persist import write_atomic
+
+# -------------------------
+# Font resolution cache
+# -------------------------
+# pygame.font.SysFont looks the name up in the system font list, and building that
+# list (fc-list on Linux, the registry on Windows) is the slowest step of starting the
+# game on machines with many fonts. The answer -- which file to load, and whether
+# bold/italic has to be faked because no such variant exists -- only changes when fonts
+# are installed or removed, so it is kept in a small JSON file and the next start opens
+# the font file directly. An entry whose file has disappeared is looked up again;
+# delete the cache file after installing a font that should replace a fallback.
+
+FONT_CACHE_FILE = "fontcache.json"
+
+
+def _capture(path, size, bold, italic):
+    # SysFont constructor that returns what it would load instead of loading it
+    return [path, bold, italic]
+
+
+class FontResolver:
+    """SysFont-compatible font loading with the lookup results cached on disk."""
+
+    def __init__(self, path=FONT_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        self.lookups = 0        # system font lookups this run (0 on a warm start)
+        self.dirty = False
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def resolve(self, name, bold=False, italic=False):
+        """[file or None for pygame's default font, fake bold, fake italic] for a font name."""
+        key = f"{name}|{'b' if bold else ''}{'i' if italic else ''}"
+        entry = self.entries.get(key)
+        if entry is None or (entry[0] is not None and not os.path.exists(entry[0])):
+            entry = pygame.font.SysFont(name, 0, bold, italic, constructor=_capture)
+            self.entries[key] = entry
+            self.lookups += 1
+            self.dirty = True
+        return entry
+
+    def font(self, name, size, bold=False, italic=False):
+        """Same font as pygame.font.SysFont(name, size, bold, italic)."""
+        path, fake_bold, fake_italic = self.resolve(name, bold, italic)
+        font = pygame.font.Font(path, size)
+        if fake_bold:
+            font.set_bold(True)
+        if fake_italic:
+            font.set_italic(True)
+        return font
+
+    def save(self, writer=None):
+        """Write new lookups to the cache file (through writer.save_file if given)."""
+        if not self.dirty:
+            return
+        data = json.dumps(self.entries, indent=1)
+        if writer is not None:
+            writer.save_file(self.path, data)
+        else:
+            write_atomic(self.path, data)
+        self.dirty = False
+
+
+if __name__ == "__main__":
+    import tempfile
+    from time import perf_counter
+
+    pygame.font.init()
+    path = os.path.join(tempfile.mkdtemp(), FONT_CACHE_FILE)
+    t0 = perf_counter()
+    for size in (56, 28, 18):
+        pygame.font.SysFont("Arial", size, bold=True)
+    t1 = perf_counter()
+    cold = FontResolver(path)
+    for size in (56, 28, 18):
+        cold.font("Arial", size, bold=True)
+    cold.save()
+    t2 = perf_counter()
+    warm = FontResolver(path)
+    for size in (56, 28, 18):
+        warm.font("Arial", size, bold=True)
+    t3 = perf_counter()
+    # SysFont's own font list is built once per process, so the first timing includes it
+    print(f"SysFont x3 {(t1 - t0) * 1000:.1f} ms, cold resolver {(t2 - t1) * 1000:.1f} ms, "
+          f"warm resolver {(t3 - t2) * 1000:.1f} ms ({warm.lookups} lookups); "
+          f"resolved to {warm.resolve('Arial', True)}")
@@ -0,0 +1,123 @@
+from math import floor
+
+import pygame
+
+from blend import compose_layers, display_alpha
+from palette import RED, WHITE
+
+# -------------------------
+# Glow sprite atlas
+# -------------------------
+# The paddle glow, HUD glow, fruit/orb halos and laser beam used to be fresh SRCALPHA
+# surfaces filled and thrown away every frame. They only depend on a size and a colour,
+# so each variant is rendered once (converted to the display format) and reused.
+
+HALO_SCALE = 1.8
+
+
+def pulse_radii(size, amount):
+    """All integer radii int(size * pulse) for pulse = 1 +/- amount (the sin() pulse range)."""
+    return range(int(size * (1.0 - amount)), int(size * (1.0 + amount)) + 1)
+
+
+class GlowAtlas:
+    """Lazily filled sprite cache; every entry is built once per size and colour."""
+
+    def __init__(self):
+        self.sprites = {}
+
+    def _get(self, key, build):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = build()
+            self.sprites[key] = sprite
+        return sprite
+
+    def paddle_glow(self, w, h, color, layers=4):
+        """Pre-composed paddle glow; returns (surface, (dx, dy)) relative to the paddle's top-left.
+
+        Blit with special_flags=pygame.BLEND_PREMULTIPLIED.
+        """
+        return self._get(("paddle", w, h, color, layers),
+                         lambda: _build_paddle_glow(w, h, color, layers))
+
+    def panel_glow(self, w, h, color, layers=6):
+        """Pre-composed HUD panel glow; returns (surface, (dx, dy)) relative to the panel."""
+        return self._get(("panel", w, h, color, layers),
+                         lambda: _build_panel_glow(w, h, color, layers))
+
+    def halo(self, r, color, alpha):
+        """Soft circular halo of radius r*1.8 on a (4r, 4r) sprite, centred at (2r, 2r)."""
+        return self._get(("halo", r, color, alpha), lambda: _build_halo(r, color, alpha))
+
+    def beam(self, width, height, color):
+        """Flat translucent laser beam sprite."""
+        return self._get(("beam", width, height, color), lambda: _build_beam(width, height, color))
+
+    def fruit(self, size, color, power):
+        """Static fruit sprite (shape as drawn for single fruits) centred at (2*size, 2*size).
+
+        Used to batch-blit fruit storm mode; the slow fruit gets a fixed, unpulsed halo.
+        """
+        return self._get(("fruit", size, color, power), lambda: _build_fruit(size, color, power))
+
+    def warm_halos(self, size, amount, color, alpha):
+        """Pre-render every halo radius a pulsing sprite of this base size can reach."""
+        for r in pulse_radii(size, amount):
+            self.halo(r, color, alpha)
+
+
+def _stacked_rects(rects, color):
+    """Compose (x, y, w, h, alpha) rect fills into one sprite; returns (surface, offset)."""
+    min_x = min(r[0] for r in rects)
+    min_y = min(r[1] for r in rects)
+    max_x = max(r[0] + r[2] for r in rects)
+    max_y = max(r[1] + r[3] for r in rects)
+    layers = []
+    for x, y, w, h, alpha in rects:
+        layer = pygame.Surface((w, h), pygame.SRCALPHA)
+        layer.fill((color[0], color[1], color[2], max(0, alpha)))
+        layers.append((layer, (x - min_x, y - min_y)))
+    return compose_layers((max_x - min_x, max_y - min_y), layers), (min_x, min_y)
+
+
+def _build_paddle_glow(w, h, color, layers):
+    # Same layer geometry as the original per-frame loop; paddle y is a positive
+    # integer so int(y - i*1.2) - y == floor(-i*1.2).
+    rects = [(-i * 2, floor(-i * 1.2), w + i * 4, h + i * 2, int(28 / i))
+             for i in range(layers, 0, -1)]
+    return _stacked_rects(rects, color)
+
+
+def _build_panel_glow(w, h, color, layers):
+    rects = [(-i * 2, -i, w + i * 4, h + i * 2, 14 - i * 2) for i in range(layers, 0, -1)]
+    return _stacked_rects(rects, color)
+
+
+def _build_halo(r, color, alpha):
+    surf = pygame.Surface((r * 4, r * 4), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (color[0], color[1], color[2], alpha), (r * 2, r * 2), int(r * HALO_SCALE))
+    return display_alpha(surf)
+
+
+def _build_fruit(size, color, power):
+    c = size * 2
+    surf = pygame.Surface((size * 4, size * 4), pygame.SRCALPHA)
+    if power == "bomb":
+        pygame.draw.circle(surf, color, (c, c), size)
+        pygame.draw.line(surf, RED, (c - size, c - size), (c + size, c + size), 4)
+        pygame.draw.line(surf, RED, (c + size, c - size), (c - size, c + size), 4)
+    elif power == "slow":
+        pygame.draw.circle(surf, (color[0], color[1], color[2], 60), (c, c), int(size * HALO_SCALE))
+        pygame.draw.circle(surf, color, (c, c), size)
+        pygame.draw.circle(surf, WHITE, (c, c), max(3, size - 6), 2)
+    else:
+        pygame.draw.circle(surf, color, (c, c), size)
+        pygame.draw.ellipse(surf, WHITE, (c - size // 2, c - size // 1.6, size // 2, size // 3))
+    return display_alpha(surf)
+
+
+def _build_beam(width, height, color):
+    surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    surf.fill(color)
+    return display_alpha(surf)
@@ -0,0 +1,204 @@
+import logging
+import os
+import sqlite3
+import time
+
+# -------------------------
+# Local leaderboard
+# -------------------------
+# Every finished run is one row in a SQLite database: score, level reached, game
+# duration and when it was played. SQLite gives atomic commits (a crash mid-write
+# leaves the previous state), and the two indexes keep the queries the game needs
+# -- best score, top N, top N of a day -- at a few index reads however many millions
+# of rows accumulate. compact() trims old history that can no longer show up in them.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    score       INTEGER NOT NULL,
+    level       INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    played_at   REAL    NOT NULL,   -- unix time
+    day         TEXT    NOT NULL    -- local date, YYYY-MM-DD
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, played_at);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+"""
+
+COLUMNS = ("score", "level", "duration_ms", "played_at", "day")
+KEEP_DAYS = 90        # compact() keeps every run this recent...
+KEEP_TOP = 1000       # ...plus the all-time top N...
+KEEP_PER_DAY = 10     # ...plus the top N of every older day
+
+log = logging.getLogger(__name__)
+
+
+def day_of(timestamp):
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+class Leaderboard:
+    """Run history in one SQLite file (":memory:" for a throwaway board)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.open_error = None    # set by open() when it fell back to ":memory:"
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path, legacy_file=None):
+        """Open (or create) the board; falls back to an in-memory one if the file is unusable.
+
+        The fallback is logged and its reason kept in open_error, since nothing recorded in
+        it outlives the process. legacy_file is an old single-integer high score file,
+        imported once into an empty board.
+        """
+        try:
+            board = cls(path)
+        except sqlite3.Error as e:
+            log.warning("cannot use leaderboard %s (%s); scores will not be saved", path, e)
+            board = cls(":memory:")
+            board.open_error = f"{path}: {e}"
+        if legacy_file and board.count() == 0:
+            board.import_legacy(legacy_file)
+        return board
+
+    def close(self):
+        self.db.close()
+
+    def record(self, score, level, duration_ms, played_at=None):
+        """Add one finished run; returns False if it could not be written."""
+        played_at = time.time() if played_at is None else played_at
+        try:
+            with self.db:
+                self.db.execute("INSERT INTO runs (score, level, duration_ms, played_at, day) VALUES (?, ?, ?, ?, ?)",
+                                (int(score), int(level), int(duration_ms), played_at, day_of(played_at)))
+        except sqlite3.Error:
+            return False
+        return True
+
+    def record_many(self, runs):
+        """Add (score, level, duration_ms, played_at) tuples in one transaction."""
+        rows = [(int(s), int(lv), int(d), t, day_of(t)) for s, lv, d, t in runs]
+        try:
+            with self.db:
+                self.db.executemany("INSERT INTO runs (score, level, duration_ms, played_at, day) "
+                                    "VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error:
+            return False
+        return True
+
+    # ----------------------
+    # Queries
+    # ----------------------
+    def best(self):
+        """Highest score ever recorded (0 for an empty board); one index lookup."""
+        row = self.db.execute("SELECT MAX(score) FROM runs").fetchone()
+        return row[0] or 0
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def top(self, n=10):
+        """The n best runs as dicts, best first (ties: earliest first)."""
+        return self._rows("SELECT score, level, duration_ms, played_at, day FROM runs "
+                          "ORDER BY score DESC, played_at LIMIT ?", (n,))
+
+    def top_of_day(self, day=None, n=10):
+        """The n best runs of one local date (default: today)."""
+        day = day or day_of(time.time())
+        return self._rows("SELECT score, level, duration_ms, played_at, day FROM runs "
+                          "WHERE day = ? ORDER BY score DESC LIMIT ?", (day, n))
+
+    def days(self, n=30):
+        """Per-day summary of the last n days played: (day, runs, best score), newest first."""
+        return self.db.execute("SELECT day, COUNT(*), MAX(score) FROM runs "
+                               "GROUP BY day ORDER BY day DESC LIMIT ?", (n,)).fetchall()
+
+    def _rows(self, sql, args):
+        return [dict(zip(COLUMNS, row)) for row in self.db.execute(sql, args)]
+
+    # ----------------------
+    # Maintenance
+    # ----------------------
+    def compact(self, keep_days=KEEP_DAYS, keep_top=KEEP_TOP, keep_per_day=KEEP_PER_DAY):
+        """Delete old runs that are in neither the all-time nor their day's top list; returns rows deleted.
+
+        Runs from the last keep_days days are always kept. The file is vacuumed afterwards.
+        """
+        cutoff = day_of(time.time() - keep_days * 86400)
+        try:
+            with self.db:
+                deleted = self.db.execute("""
+                    DELETE FROM runs WHERE day < ?
+                      AND id NOT IN (SELECT id FROM runs ORDER BY score DESC, played_at LIMIT ?)
+                      AND id NOT IN (SELECT id FROM (
+                          SELECT id, ROW_NUMBER() OVER (PARTITION BY day ORDER BY score DESC) AS rank
+                          FROM runs WHERE day < ?) WHERE rank <= ?)
+                """, (cutoff, keep_top, cutoff, keep_per_day)).rowcount
+            self.db.execute("VACUUM")
+        except sqlite3.Error:
+            return 0
+        return deleted
+
+    def import_legacy(self, filename):
+        """Import an old highscore.txt (one integer) as a single run dated by the file's mtime."""
+        try:
+            with open(filename, "r") as f:
+                score = int(f.read().strip() or 0)
+            played_at = os.path.getmtime(filename)
+        except (OSError, ValueError):
+            return False
+        return score > 0 and self.record(score, 0, 0, played_at)
+
+
+def _bench(rows=1_000_000, path=":memory:"):
+    import random
+    from time import perf_counter
+    board = Leaderboard(path)
+    rng = random.Random(0)
+    start = time.time() - 365 * 86400
+    t0 = perf_counter()
+    for chunk in range(0, rows, 100_000):
+        board.record_many((rng.randint(0, 400), rng.randint(1, 40), rng.randint(5_000, 600_000),
+                           start + rng.random() * 365 * 86400) for _ in range(min(100_000, rows - chunk)))
+    print(f"insert {rows:,} rows: {perf_counter() - t0:.1f}s")
+    some_day = board.days(1)[0][0]
+    for label, query in (("best()", board.best), ("top(10)", lambda: board.top(10)),
+                         ("top_of_day(10)", lambda: board.top_of_day(some_day, 10)),
+                         ("record()", lambda: board.record(123, 5, 60_000))):
+        t0 = perf_counter()
+        for _ in range(100):
+            query()
+        print(f"{label:15} {(perf_counter() - t0) * 10:.3f} ms")
+    t0 = perf_counter()
+    deleted = board.compact()
+    print(f"compact(): {deleted:,} rows deleted in {perf_counter() - t0:.1f}s, {board.count():,} left")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Catch the Fruit leaderboard")
+    parser.add_argument("command", choices=("top", "today", "days", "compact", "bench"))
+    parser.add_argument("--db", default="leaderboard.db")
+    parser.add_argument("-n", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        _bench()
+    else:
+        board = Leaderboard(args.db)
+        if args.command in ("top", "today"):
+            runs = board.top(args.n) if args.command == "top" else board.top_of_day(n=args.n)
+            for i, run in enumerate(runs, 1):
+                print(f"{i:3}. {run['score']:6}  level {run['level']:3}  {run['duration_ms'] / 1000:6.1f}s  "
+                      f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(run['played_at']))}")
+        elif args.command == "days":
+            for day, runs, best in board.days(args.n):
+                print(f"{day}  {runs:6} runs  best {best}")
+        else:
+            print(f"{board.compact():,} runs removed, {board.count():,} kept")
@@ -0,0 +1,13 @@
+# -------------------------
+# Neon palette
+# -------------------------
+BLACK = (6, 6, 10)
+NEON_PINK = (255, 64, 200)
+NEON_BLUE = (48, 200, 255)
+NEON_GREEN = (120, 255, 120)
+NEON_YELLOW = (255, 225, 60)
+NEON_ORANGE = (255, 140, 0)
+RED = (255, 60, 60)
+GRAY = (120, 120, 120)
+WHITE = (255, 255, 255)
+PURPLE = (160, 64, 240)
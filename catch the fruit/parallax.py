@@ -0,0 +1,139 @@
+import random
+
+import pygame
+
+from palette import NEON_BLUE, NEON_PINK
+
+# -------------------------
+# Parallax background
+# -------------------------
+# The falling neon lines behind the menu and the playfield. Each depth layer is one
+# screen-sized strip with its lines drawn once, tileable vertically (a line that runs
+# off the bottom continues at the top). Scrolling a layer is moving its offset; drawing
+# it is two blits, the strip and its wrapped copy above it, whatever the line count.
+#
+# A sparse strip is colour-keyed and RLE-encoded, so its blits only touch the line
+# pixels. Past DENSE_COVERAGE that stops paying off, and a dense strip is blitted
+# whole with BLEND_RGB_MAX instead (the lines are brighter than the backgrounds), at a
+# fixed cost per screen pixel however many lines it holds.
+
+# Depth layers, far to near: speed (px per 60 Hz frame), lines, line width, brightness
+LAYERS = (
+    (0.18, 10, 1, 0.45),
+    (0.35, 8, 2, 0.7),
+    (0.6, 6, 2, 1.0),
+)
+LINE_LENGTH = (60, 180)
+COLORS = (NEON_BLUE, NEON_PINK)
+KEY = (0, 0, 0)           # strip transparency; no line colour is pure black
+DENSE_COVERAGE = 0.1      # share of the strip covered by lines above which it is max-blended
+
+
+class ParallaxLayer:
+    """One pre-rendered, vertically tileable strip of lines scrolling at a fixed speed."""
+
+    def __init__(self, size, speed, lines, width, brightness, rng):
+        self.speed = speed
+        self.offset = 0.0
+        self.height = size[1]
+        # made in the display's pixel format when there is one (no convert() copy)
+        display = pygame.display.get_surface()
+        self.strip = pygame.Surface(size, 0, display) if display else pygame.Surface(size)
+        self.strip.fill(KEY)
+        self.lines = []           # rects of the drawn lines in strip coordinates
+        for _ in range(lines):
+            color = [int(c * brightness) for c in rng.choice(COLORS)]
+            x = rng.randint(0, size[0])
+            y = rng.randint(0, self.height - 1)
+            length = rng.randint(*LINE_LENGTH)
+            # the part below the strip is drawn again one strip height higher
+            for top in (y, y - self.height):
+                self.lines.append(pygame.draw.line(self.strip, color, (x, top), (x, top + length), width))
+        self.lines = [r for r in self.lines if r]
+        coverage = sum(r.w * r.h for r in self.lines) / (size[0] * size[1])
+        if coverage > DENSE_COVERAGE:
+            self.flags = pygame.BLEND_RGB_MAX
+        else:
+            self.flags = 0
+            self.strip.set_colorkey(KEY, pygame.RLEACCEL)
+
+    def scroll(self, frames):
+        self.offset = (self.offset + self.speed * frames) % self.height
+
+    def draw(self, surface, rects=False):
+        """Blit the strip at its offset (plus the wrapped copy); returns line rects if asked."""
+        y = int(self.offset)
+        surface.blit(self.strip, (0, y), special_flags=self.flags)
+        surface.blit(self.strip, (0, y - self.height), special_flags=self.flags)
+        if not rects:
+            return []
+        # only the lines changed pixels: report those, not the two screen-sized blits
+        bounds = surface.get_rect()
+        moved = [r.move(0, y) for r in self.lines] + [r.move(0, y - self.height) for r in self.lines]
+        return [r for r in (bounds.clip(r) for r in moved) if r]
+
+
+class Parallax:
+    """The stack of layers shared by every screen; built on the first draw."""
+
+    def __init__(self, layers=LAYERS, seed=None):
+        self.specs = layers
+        self.seed = seed
+        self.layers = []
+        self.size = None
+
+    def build(self, size):
+        rng = random.Random(self.seed)
+        self.layers = [ParallaxLayer(size, *spec, rng) for spec in self.specs]
+        self.size = size
+
+    def draw(self, surface, frames, speed=1.0, count=None, rects=False):
+        """Scroll every layer by `frames` 60 Hz frames at `speed`, then draw the nearest `count`.
+
+        Returns the rects of the drawn lines when rects is True (for dirty-rect presenting).
+        """
+        if surface.get_size() != self.size:
+            self.build(surface.get_size())
+        for layer in self.layers:
+            layer.scroll(frames * speed)
+        drawn = []
+        shown = self.layers if count is None else self.layers[len(self.layers) - count:]
+        for layer in shown:
+            drawn += layer.draw(surface, rects)
+        return drawn
+
+
+if __name__ == "__main__":
+    import os
+    from time import perf_counter
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    screen = pygame.display.set_mode((480, 720))
+    frames = 600
+    for total in (24, 240, 960, 4800):
+        # the old way: one list per line, moved, recycled and drawn each frame
+        rng = random.Random(0)
+        lines = [[rng.randint(0, 480), rng.randint(0, 720), rng.randint(*LINE_LENGTH),
+                  rng.uniform(0.15, 0.7), rng.choice(COLORS)] for _ in range(total)]
+        t0 = perf_counter()
+        for _ in range(frames):
+            for line in lines:
+                line[1] += line[3]
+                if line[1] > 720 + line[2]:
+                    line[0] = rng.randint(-80, 480)
+                    line[1] = -rng.randint(20, 160)
+                    line[2] = rng.randint(*LINE_LENGTH)
+                    line[3] = rng.uniform(0.15, 0.7)
+                    line[4] = rng.choice(COLORS)
+                lx, ly, length, _, color = line
+                pygame.draw.line(screen, color, (lx, ly), (lx, ly + length), 2)
+        lines_ms = (perf_counter() - t0) * 1000 / frames
+        scale = total / sum(spec[1] for spec in LAYERS)
+        field = Parallax([(s, round(n * scale), w, b) for s, n, w, b in LAYERS], seed=0)
+        field.draw(screen, 1.0)
+        t0 = perf_counter()
+        for _ in range(frames):
+            field.draw(screen, 1.0)
+        strips_ms = (perf_counter() - t0) * 1000 / frames
+        print(f"{total:4} lines: per-line {lines_ms:.3f} ms, strips {strips_ms:.3f} ms per frame")
+    pygame.quit()
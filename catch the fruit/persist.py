@@ -0,0 +1,168 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from leaderboard import Leaderboard
+
+# -------------------------
+# Background persistence
+# -------------------------
+# Disk writes (leaderboard rows, replay files, profiler exports) can take hundreds of
+# milliseconds on SD cards and network home directories, so the game never does them
+# itself: it queues them here and a worker thread carries them out. Whatever piled up
+# while the worker was busy is handled as one batch: runs go into a single
+# transaction, repeated writes of the same file keep only the last contents, and
+# appends to a file are joined. Files are written to a temporary name, synced and
+# renamed over the target, so a crash never leaves a half-written file. close() (also
+# registered with atexit) drains the queue before returning.
+
+CLOSE_TIMEOUT = 5.0   # seconds close() waits for the worker to finish
+
+log = logging.getLogger(__name__)
+
+
+def write_atomic(path, data):
+    """Write bytes or text to path via a synced temp file renamed over it."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    mode = "wb" if isinstance(data, bytes) else "w"
+    try:
+        with open(tmp, mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def append_text(path, text, header=None):
+    """Append text to path, writing header first if the file does not exist yet."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    new_file = not os.path.exists(path)
+    with open(path, "a", newline="") as f:
+        if new_file and header:
+            f.write(header)
+        f.write(text)
+
+
+class PersistenceWorker:
+    """Thread that owns the game's writes; every public method only enqueues."""
+
+    _STOP = object()
+
+    def __init__(self, leaderboard_path):
+        self.leaderboard_path = leaderboard_path
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.writes = 0
+        self.errors = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    # ----------------------
+    # Game-side API (non-blocking)
+    # ----------------------
+    def record_run(self, score, level, duration_ms):
+        self.queue.put(("run", (int(score), int(level), int(duration_ms), time.time())))
+
+    def save_file(self, path, data):
+        """Replace path's contents atomically (only the last queued contents are written)."""
+        self.queue.put(("file", path, data))
+
+    def append_file(self, path, text, header=None):
+        self.queue.put(("append", path, text, header))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is on disk; returns False on timeout."""
+        done = threading.Event()
+        self.queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Write everything still queued and stop the worker."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(self._STOP)
+        self.thread.join(timeout)
+
+    # ----------------------
+    # Worker thread
+    # ----------------------
+    def _run(self):
+        # SQLite connections belong to the thread that opened them
+        board = Leaderboard.open(self.leaderboard_path)
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            runs = []
+            files = {}
+            appends = {}
+            waiters = []
+            for item in batch:
+                if item is self._STOP:
+                    stop = True
+                elif item[0] == "run":
+                    runs.append(item[1])
+                elif item[0] == "file":
+                    files[item[1]] = item[2]
+                elif item[0] == "append":
+                    _, path, text, header = item
+                    if path in appends:
+                        appends[path][0].append(text)
+                    else:
+                        appends[path] = ([text], header)
+                else:
+                    waiters.append(item[1])
+            self.batches += 1
+            if runs:
+                try:
+                    recorded = board.record_many(runs)
+                except Exception:
+                    recorded = False
+                if recorded:
+                    self.writes += 1
+                else:
+                    # one at a time, so a bad run does not take the rest of the batch along
+                    for run in runs:
+                        self._write(self._record_run, board, run)
+            for path, data in files.items():
+                self._write(write_atomic, path, data)
+            for path, (texts, header) in appends.items():
+                self._write(append_text, path, "".join(texts), header)
+            for done in waiters:
+                done.set()
+        board.close()
+
+    @staticmethod
+    def _record_run(board, run):
+        if not board.record(*run):
+            raise sqlite3.Error(f"run {run} not recorded in {board.path}")
+
+    def _write(self, write, *args):
+        # any failure is counted and logged; letting it end the thread would silently
+        # lose every later write, the final flush at exit included
+        try:
+            write(*args)
+            self.writes += 1
+        except Exception:
+            self.errors += 1
+            log.exception("%s failed", write.__name__.lstrip("_"))
@@ -0,0 +1,161 @@
+import threading
+from collections import namedtuple
+
+# -------------------------
+# Simulation / render pipeline
+# -------------------------
+# Optional two-stage frame loop. The main thread keeps the window's event queue and
+# the simulation; a render thread draws and presents. They share nothing mutable:
+# after its ticks the main thread publishes an immutable snapshot of everything the
+# renderer reads, and the render thread only ever sees snapshots. While the render
+# thread blits and flips (SDL releases the GIL for those), the main thread is already
+# reading input and simulating the next frame.
+#
+# SnapshotBuffer holds at most `depth` unrendered snapshots. With drop=True (the game's
+# setting) publishing never blocks: a full buffer discards its oldest snapshot, so a slow
+# frame costs a skipped picture instead of a late physics update. Only the picture is
+# skipped: `merge` folds what the dropped item carried beyond its snapshot into the item
+# drawn in its place (for Frames, merge_frames keeps the elapsed time and the particle
+# events). With drop=False the producer waits for a free slot, so every snapshot is drawn
+# (used for benchmarking).
+
+BUFFER_DEPTH = 2          # unrendered snapshots; with the one being drawn, a triple buffer
+STOP_TIMEOUT = 2.0        # seconds RenderThread.stop() waits for the last frame
+
+PIPELINE_MODES = ("latest", "every")   # drop=True / drop=False hand-over
+
+# One frame's work order for the renderer: screen state, the game (a GameView snapshot
+# on the render thread), interpolation alpha, frame time, effect events of its ticks
+Frame = namedtuple("Frame", "screen game alpha dt high_score paused events game_id overlay")
+
+PlayerView = namedtuple("PlayerView", "x prev_x y w h")
+FruitView = namedtuple("FruitView", "x y prev_x prev_y size color power")
+MysteryView = namedtuple("MysteryView", "x y prev_x prev_y size")
+LaserView = namedtuple("LaserView", "y start")
+PopView = namedtuple("PopView", "x y text start")
+FlashView = namedtuple("FlashView", "color")
+StormView = namedtuple("StormView", "count x y prev_x prev_y kind")
+KindView = namedtuple("KindView", "size color power")
+GameView = namedtuple("GameView", "player fruit mystery laser pops hud_flash storm fruit_types time_ms "
+                                  "score lives level power_bar combo super_active over")
+
+
+def merge_frames(dropped, frame):
+    """frame standing in for an undrawn earlier one: its time and effect events included."""
+    events = frame.events
+    if dropped.events and dropped.game_id == frame.game_id:
+        events = dropped.events + events
+    return frame._replace(dt=dropped.dt + frame.dt, events=events)
+
+
+def _copy(view, entity):
+    return None if entity is None else view(*(getattr(entity, f) for f in view._fields))
+
+
+def snapshot(game):
+    """Immutable copy of what the renderer reads from a GameState (attribute-compatible)."""
+    storm = None
+    if game.storm is not None:
+        s = game.storm
+        n = s.count
+        storm = StormView(n, s.x[:n].copy(), s.y[:n].copy(), s.prev_x[:n].copy(), s.prev_y[:n].copy(),
+                          s.kind[:n].copy())
+    return GameView(_copy(PlayerView, game.player), _copy(FruitView, game.fruit),
+                    _copy(MysteryView, game.mystery), _copy(LaserView, game.laser),
+                    tuple(_copy(PopView, p) for p in game.pops), _copy(FlashView, game.hud_flash),
+                    storm, tuple(_copy(KindView, f) for f in game.fruit_types),
+                    game.time_ms, game.score, game.lives, game.level, game.power_bar, game.combo,
+                    game.super_active, game.over)
+
+
+class SnapshotBuffer:
+    """Bounded hand-over of snapshots from one producer to one consumer."""
+
+    def __init__(self, depth=BUFFER_DEPTH, drop=True, merge=None):
+        self.depth = depth
+        self.drop = drop
+        self.merge = merge        # merge(dropped, next) -> item drawn instead of both
+        self.items = []
+        self.cond = threading.Condition()
+        self.published = 0
+        self.dropped = 0
+        self.taken = 0
+        self.stopped = False
+
+    def publish(self, item):
+        with self.cond:
+            if self.stopped:
+                return
+            if len(self.items) >= self.depth:
+                if self.drop:
+                    dropped = self.items.pop(0)
+                    self.dropped += 1
+                    if self.merge:
+                        # the next item to be drawn takes over the dropped one's payload
+                        if self.items:
+                            self.items[0] = self.merge(dropped, self.items[0])
+                        else:
+                            item = self.merge(dropped, item)
+                else:
+                    self.cond.wait_for(lambda: len(self.items) < self.depth or self.stopped)
+            self.items.append(item)
+            self.published += 1
+            self.cond.notify_all()
+
+    def take(self):
+        """Oldest pending snapshot; blocks until there is one. Returns None once stopped."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.items or self.stopped)
+            if not self.items:
+                return None
+            item = self.items.pop(0)
+            self.taken += 1
+            self.cond.notify_all()
+            return item
+
+    def drain(self, timeout=None):
+        """Wait until the consumer has taken everything published; returns False on timeout."""
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.items or self.stopped, timeout)
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+
+
+class RenderThread:
+    """Runs render(item) for every snapshot taken from buffer until stop()."""
+
+    def __init__(self, render, buffer):
+        self.render = render
+        self.buffer = buffer
+        self.frames = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                item = self.buffer.take()
+                if item is None:
+                    return
+                self.render(item)
+                self.frames += 1
+        except BaseException as e:   # handed to the main thread by check()/stop()
+            self.error = e
+            self.buffer.stop()
+
+    def check(self):
+        """Re-raise a render-thread exception on the calling thread."""
+        if self.error is not None:
+            raise self.error
+
+    def stop(self, timeout=STOP_TIMEOUT, finish=True):
+        """Stop after the frames already published (finish=True) or right away."""
+        if finish and self.thread.is_alive():
+            self.buffer.drain(timeout)
+        self.buffer.stop()
+        self.thread.join(timeout)
+        self.check()
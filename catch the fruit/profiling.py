@@ -0,0 +1,248 @@
+import csv
+import io
+import json
+import time
+from array import array
+from time import perf_counter_ns
+
+import pygame
+
+from persist import append_text, write_atomic
+
+# -------------------------
+# Frame section timing
+# -------------------------
+# run_game calls timer.begin_frame() once its frame time is known, timer.mark(section)
+# after each block of work and timer.end_frame(screen) once the frame is presented.
+# The time since the previous mark is charged to the section named by the later one.
+
+SECTIONS = ("events", "background", "bg_lines", "physics", "collision", "snapshot", "sprites", "particles",
+            "hud", "pops", "overlay", "capture", "flip")
+
+
+class PhaseTimer:
+    """Collects per-frame section times in nanoseconds, grouped by screen state."""
+
+    def __init__(self):
+        self.frames = {}     # screen -> [{section: ns, ..., "total": ns}, ...]
+        self.current = {}
+        self.last = self.frame_start = perf_counter_ns()
+
+    def begin_frame(self):
+        self.current = {}
+        self.last = self.frame_start = perf_counter_ns()
+
+    def mark(self, section):
+        now = perf_counter_ns()
+        current = self.current
+        current[section] = current.get(section, 0) + now - self.last
+        self.last = now
+
+    def end_frame(self, screen):
+        self.current["total"] = perf_counter_ns() - self.frame_start
+        self.frames.setdefault(screen, []).append(self.current)
+        self.current = {}
+
+    def clear(self):
+        self.frames.clear()
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile (q in [0, 100]) of an already sorted list."""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(values):
+    """mean / p50 / p99 / max of a list of numbers."""
+    if not values:
+        return {"mean": 0, "p50": 0, "p99": 0, "max": 0}
+    ordered = sorted(values)
+    return {"mean": sum(ordered) / len(ordered), "p50": percentile(ordered, 50),
+            "p99": percentile(ordered, 99), "max": ordered[-1]}
+
+
+# -------------------------
+# Live profiler (ring buffer)
+# -------------------------
+# Same hooks as PhaseTimer, but it only keeps the last `capacity` frames in preallocated
+# int64 arrays, so it can stay on for hours. run_game only calls it while it is switched
+# on (F3); when off, each hook is a single `if timer:` test.
+
+PROFILE_FRAMES = 600          # ring size (10 s at 60 fps)
+EXPORT_INTERVAL = 10.0        # seconds between exports
+CSV_HEADER = "time,screen,frames,section,mean_ms,p50_ms,p99_ms,max_ms\r\n"
+
+
+class FrameProfiler:
+    """Ring buffer of per-section frame times with periodic CSV/JSON export."""
+
+    def __init__(self, capacity=PROFILE_FRAMES, export_path=None, export_interval=EXPORT_INTERVAL, writer=None):
+        self.capacity = capacity
+        self.slot = {name: i for i, name in enumerate(SECTIONS)}
+        self.ring = [array("q", bytes(8 * capacity)) for _ in SECTIONS]
+        self.totals = array("q", bytes(8 * capacity))
+        self.row = [0] * len(SECTIONS)
+        self.count = 0              # frames recorded since creation
+        self.screen = None
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self.writer = writer
+        self.last_export = time.monotonic()
+        self.last = self.frame_start = perf_counter_ns()
+
+    def begin_frame(self):
+        row = self.row
+        for i in range(len(row)):
+            row[i] = 0
+        self.last = self.frame_start = perf_counter_ns()
+
+    def mark(self, section):
+        now = perf_counter_ns()
+        self.row[self.slot[section]] += now - self.last
+        self.last = now
+
+    def end_frame(self, screen):
+        i = self.count % self.capacity
+        for ring, ns in zip(self.ring, self.row):
+            ring[i] = ns
+        self.totals[i] = perf_counter_ns() - self.frame_start
+        self.count += 1
+        self.screen = screen
+        if self.export_path and time.monotonic() - self.last_export >= self.export_interval:
+            self.export()
+
+    def _window(self, values, n=None):
+        """The last n (default: all buffered) values of a ring, oldest first."""
+        size = min(self.count, self.capacity)
+        n = size if n is None else min(n, size)
+        end = self.count % self.capacity
+        if end >= n:
+            return values[end - n:end].tolist()
+        return values[self.capacity - (n - end):].tolist() + values[:end].tolist()
+
+    def recent_frames(self, n):
+        """Total frame work time (ms) of the last n frames, oldest first."""
+        return [ns / 1e6 for ns in self._window(self.totals, n)]
+
+    def stats(self):
+        """{section: summarize(ms)} over the buffered frames, plus "frame" for the totals."""
+        out = {"frame": summarize([ns / 1e6 for ns in self._window(self.totals)])}
+        for name, ring in zip(SECTIONS, self.ring):
+            out[name] = summarize([ns / 1e6 for ns in self._window(ring)])
+        return out
+
+    def slowest(self, k=3, stats=None):
+        """The k sections with the highest mean time, as (name, stats) pairs."""
+        stats = stats or self.stats()
+        sections = [(name, stats[name]) for name in SECTIONS if stats[name]["max"] > 0]
+        return sorted(sections, key=lambda item: item[1]["mean"], reverse=True)[:k]
+
+    def export(self, path=None):
+        """Write the window's stats: JSON replaces the file, CSV appends one row per section.
+
+        With a writer (persist.PersistenceWorker) the write is queued instead of done here.
+        """
+        path = path or self.export_path
+        self.last_export = time.monotonic()
+        stats = self.stats()
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        frames = min(self.count, self.capacity)
+        if path.endswith(".json"):
+            text = json.dumps({"time": stamp, "screen": self.screen, "frames": frames,
+                               "sections_ms": stats}, indent=1)
+            if self.writer:
+                self.writer.save_file(path, text)
+                return True
+            write, args = write_atomic, (path, text)
+        else:
+            out = io.StringIO()
+            rows = csv.writer(out)
+            for name, s in stats.items():
+                rows.writerow([stamp, self.screen, frames, name, f"{s['mean']:.4f}",
+                               f"{s['p50']:.4f}", f"{s['p99']:.4f}", f"{s['max']:.4f}"])
+            if self.writer:
+                self.writer.append_file(path, out.getvalue(), CSV_HEADER)
+                return True
+            write, args = append_text, (path, out.getvalue(), CSV_HEADER)
+        try:
+            write(*args)
+        except OSError:
+            return False
+        return True
+
+# -------------------------
+# On-screen overlay
+# -------------------------
+GRAPH_FRAMES = 120
+GRAPH_SIZE = (240, 60)
+BUDGET_MS = 1000.0 / 60       # one frame at 60 fps, drawn as a reference line
+TEXT_REFRESH_MS = 250         # the numbers are re-rendered at most this often
+
+
+class ProfilerOverlay:
+    """Frame-time graph plus the slowest sections, drawn in a corner of the screen."""
+
+    def __init__(self, font, pos=None):
+        self.font = font
+        self.pos = pos
+        self.panel = pygame.Surface((GRAPH_SIZE[0] + 8, GRAPH_SIZE[1] + 103))
+        self.panel.fill((0, 0, 0))
+        self.panel.set_alpha(170)
+        self.lines = []
+        self.next_text = 0
+
+    def _refresh_text(self, profiler, note):
+        stats = profiler.stats()
+        f = stats["frame"]
+        rows = [f"frame {f['mean']:.2f} ms  p99 {f['p99']:.2f}  max {f['max']:.2f}"]
+        for name, s in profiler.slowest(3, stats):
+            rows.append(f"{name:<10} {s['mean']:.2f} ms  p99 {s['p99']:.2f}")
+        if note:
+            rows.append(note)
+        self.lines = [self.font.render(row, True, (230, 230, 230)) for row in rows]
+
+    def draw(self, surface, profiler, note=None):
+        """Draw the overlay (plus an optional last line of text); returns the screen rect it covers."""
+        now = perf_counter_ns() // 1_000_000
+        if now >= self.next_text:
+            self._refresh_text(profiler, note)
+            self.next_text = now + TEXT_REFRESH_MS
+        # bottom-left corner unless placed explicitly
+        x, y = self.pos or (8, surface.get_height() - self.panel.get_height() - 8)
+        area = surface.blit(self.panel, (x, y))
+        gw, gh = GRAPH_SIZE
+        gx, gy = x + 4, y + 4
+        # budget line at 60 fps; the graph's scale is two frame budgets
+        scale = gh / (2 * BUDGET_MS)
+        pygame.draw.line(surface, (90, 90, 90), (gx, gy + gh - BUDGET_MS * scale), (gx + gw, gy + gh - BUDGET_MS * scale))
+        frames = profiler.recent_frames(GRAPH_FRAMES)
+        if len(frames) > 1:
+            step = gw / (GRAPH_FRAMES - 1)
+            points = [(gx + i * step, gy + gh - min(ms * scale, gh)) for i, ms in enumerate(frames)]
+            pygame.draw.lines(surface, (120, 255, 140), False, points)
+        for i, line in enumerate(self.lines):
+            surface.blit(line, (gx, gy + gh + 4 + i * 19))
+        return area
+
+
+# -------------------------
+# Startup timing
+# -------------------------
+class StartupTimer:
+    """Wall-clock marks from launch to the first presented frame."""
+
+    def __init__(self, launched):
+        self.marks = [("launch", launched)]
+
+    def mark(self, step):
+        self.marks.append((step, time.perf_counter()))
+
+    def report(self):
+        """One line per step with its own time, then the time to the first frame."""
+        rows = [f"{step:<12} {(t - before) * 1000:8.1f} ms"
+                for (_, before), (step, t) in zip(self.marks, self.marks[1:])]
+        rows.append(f"{'total':<12} {(self.marks[-1][1] - self.marks[0][1]) * 1000:8.1f} ms to first frame")
+        return "\n".join(rows)
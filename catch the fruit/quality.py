@@ -0,0 +1,133 @@
+from collections import deque, namedtuple
+from time import perf_counter
+
+# -------------------------
+# Adaptive quality
+# -------------------------
+# The glow layers, parallax layers, halos, particles and score pops are the part of a
+# frame whose cost we can choose. QualityGovernor watches the renderer's recent frame
+# times and steps through TIERS, cheapest last, to keep frames inside the budget.
+#
+# It steps down when more than DOWN_MISS_RATIO of the last WINDOW frames took longer
+# than MISS_FACTOR budgets, and steps back up only after a tier has held for `hold`
+# frames with no misses and the slowest 10% of frames' drawing work under
+# UP_HEADROOM of the budget. Going up needs far more evidence than going down, and an
+# upgrade that has to be undone soon doubles `hold`, so a machine sitting on the edge
+# of two tiers settles on the cheaper one instead of flickering between them.
+
+WINDOW = 90               # frames of history a decision looks at
+CHECK_EVERY = 30          # frames between decisions
+MISS_FACTOR = 1.25        # a frame period over this many budgets is a miss
+DOWN_MISS_RATIO = 0.1     # step down when more than this share of the window missed
+UP_HEADROOM = 0.5         # step up when p90 drawing work is under this share of the budget
+HOLD_FRAMES = 300         # frames a tier must hold before stepping up (~5 s at 60 fps)
+MAX_HOLD_FRAMES = 4800    # cap for the doubled hold after an undone upgrade
+BOUNCE_FRAMES = 600       # a step down this soon after a step up counts as a bounce
+HITCH_MS = 250.0          # longer gaps (window drag, loading) are not frame samples
+HISTORY = 64              # tier changes kept for diagnostics
+
+# text_glow caps neon_text's glow_strength; paddle_glow / panel_glow are glow layers
+# (0 = no glow sprite); parallax is the number of background layers drawn; particles
+# the live particle budget; pops the newest score pops drawn (None = every pop);
+# halo_pulse animates halos
+Tier = namedtuple("Tier", "name text_glow paddle_glow panel_glow parallax particles pops halo_pulse")
+
+TIERS = (
+    Tier("high", 5, 4, 6, 3, 1500, None, True),
+    Tier("medium", 3, 3, 4, 3, 800, 16, True),
+    Tier("low", 2, 2, 2, 2, 300, 6, False),
+    Tier("minimal", 1, 0, 0, 1, 100, 2, False),
+)
+TIER_NAMES = tuple(t.name for t in TIERS)
+QUALITY_MODES = ("auto",) + TIER_NAMES
+
+# One entry of QualityGovernor.history
+Change = namedtuple("Change", "time frame old new reason")
+
+
+def _p90(values):
+    ordered = sorted(values)
+    return ordered[int(len(ordered) * 0.9)] if ordered else 0.0
+
+
+class QualityGovernor:
+    """Picks a quality tier from recent frame times; mode "auto" or a fixed tier name."""
+
+    def __init__(self, budget_ms, mode="auto", tiers=TIERS):
+        self.tiers = tiers
+        self.budget_ms = budget_ms
+        self.auto = mode == "auto"
+        self.level = 0 if self.auto else [t.name for t in tiers].index(mode)
+        self.periods = deque(maxlen=WINDOW)
+        self.work = deque(maxlen=WINDOW)
+        self.frames = 0
+        self.changed_at = 0         # frame of the last tier change
+        self.raised_at = None       # frame of the last step up
+        self.hold = HOLD_FRAMES
+        self.history = deque(maxlen=HISTORY)
+
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+
+    def frame(self, period_ms, work_ms):
+        """Record one presented frame; returns True when the tier changed.
+
+        period_ms is the time since the previous frame started, work_ms the drawing time
+        before the present (which may wait for the display).
+        """
+        if not self.auto:
+            return False
+        self.frames += 1
+        if period_ms > HITCH_MS:
+            return False
+        self.periods.append(period_ms)
+        self.work.append(work_ms)
+        if self.frames % CHECK_EVERY or len(self.periods) < WINDOW:
+            return False
+        limit = self.budget_ms * MISS_FACTOR
+        misses = sum(1 for p in self.periods if p > limit)
+        if misses > DOWN_MISS_RATIO * len(self.periods):
+            if self.level == len(self.tiers) - 1:
+                return False
+            if self.raised_at is not None and self.frames - self.raised_at < BOUNCE_FRAMES:
+                self.hold = min(self.hold * 2, MAX_HOLD_FRAMES)
+            self._change(self.level + 1, f"{misses}/{len(self.periods)} frames over {limit:.1f} ms")
+            return True
+        if self.level and not misses and self.frames - self.changed_at >= self.hold:
+            work = _p90(self.work)
+            if work < self.budget_ms * UP_HEADROOM:
+                self.raised_at = self.frames
+                self._change(self.level - 1, f"p90 work {work:.1f} ms")
+                return True
+        return False
+
+    def _change(self, level, reason):
+        self.history.append(Change(perf_counter(), self.frames, self.tier.name, self.tiers[level].name, reason))
+        self.level = level
+        self.changed_at = self.frames
+        # a fresh tier is judged on its own frames only
+        self.periods.clear()
+        self.work.clear()
+
+    def summary(self):
+        """One line for the profiler overlay."""
+        mode = "auto" if self.auto else "fixed"
+        return f"quality {self.tier.name} ({mode}, {len(self.history)} changes)"
+
+
+if __name__ == "__main__":
+    import random
+
+    # a machine that needs ~26 ms for a high-tier frame at 60 fps, each tier ~30% cheaper;
+    # halfway through, the load drops (e.g. the fruit storm ends)
+    rng = random.Random(0)
+    budget = 1000 / 60
+    gov = QualityGovernor(budget)
+    for frame in range(6000):
+        base = 26.0 if frame < 3000 else 9.0
+        work = base * 0.7 ** gov.level * rng.uniform(0.85, 1.2)
+        gov.frame(max(budget, work), work)
+    for change in gov.history:
+        print(f"frame {change.frame:5}: {change.old:>7} -> {change.new:<7} {change.reason}")
+    print(gov.summary(), f"hold {gov.hold} frames")
@@ -0,0 +1,184 @@
+import random
+import struct
+
+from simulation import TICK_RATE, TICK_DT, GameState, step
+
+# -------------------------
+# Replay format
+# -------------------------
+# A run is fully determined by its RNG seed, its mode and the input bits fed to each
+# tick, because the simulation has its own seeded RNG and tick clock. The file is:
+#
+#   header  "CTFR", version, tick rate, storm size, seed, tick count, final score, level
+#   body    runs of identical per-tick inputs, each one LEB128 varint of
+#           (run_length << 3) | input_bits
+#
+# Held keys change rarely, so a typical minute of play is a few hundred bytes.
+
+MAGIC = b"CTFR"
+VERSION = 1
+HEADER = struct.Struct("<4sBHIQIiH")
+
+
+class ReplayError(Exception):
+    pass
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(63)
+
+
+def _put_varint(out, n):
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return
+
+
+def _get_varint(data, pos):
+    n = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated replay body")
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return n, pos
+        shift += 7
+
+
+class Replay:
+    """Seed, mode and per-tick input runs of one game, plus its recorded result."""
+
+    def __init__(self, seed, storm=0, runs=None, score=0, level=1, tick_rate=TICK_RATE):
+        self.seed = seed
+        self.storm = storm
+        self.runs = runs if runs is not None else []   # [input_bits, length] pairs
+        self.score = score
+        self.level = level
+        self.tick_rate = tick_rate
+
+    @property
+    def ticks(self):
+        return sum(n for _, n in self.runs)
+
+    def new_game(self):
+        return GameState(random.Random(self.seed), storm=self.storm)
+
+    def inputs(self):
+        """Per-tick input bits, expanded from the runs."""
+        for bits, n in self.runs:
+            for _ in range(n):
+                yield bits
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.tick_rate, self.storm, self.seed,
+                                    self.ticks, self.score, self.level))
+        for bits, n in self.runs:
+            _put_varint(out, (n << 3) | bits)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ReplayError("not a replay: file too short")
+        magic, version, tick_rate, storm, seed, ticks, score, level = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a replay: bad magic")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        runs = []
+        pos = HEADER.size
+        while pos < len(data):
+            v, pos = _get_varint(data, pos)
+            runs.append([v & 7, v >> 3])
+        replay = cls(seed, storm, runs, score, level, tick_rate)
+        if replay.ticks != ticks:
+            raise ReplayError(f"header says {ticks} ticks, body has {replay.ticks}")
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class Recorder:
+    """Collects the inputs of a live game; finish() stamps the result."""
+
+    def __init__(self, seed, storm=0):
+        self.replay = Replay(seed, storm)
+
+    def record(self, bits):
+        runs = self.replay.runs
+        if runs and runs[-1][0] == bits:
+            runs[-1][1] += 1
+        else:
+            runs.append([bits, 1])
+
+    def finish(self, state):
+        self.replay.score = state.score
+        self.replay.level = state.level
+        return self.replay
+
+# -------------------------
+# Playback
+# -------------------------
+def play(replay, state=None):
+    """Run a replay headless as fast as possible; returns the final GameState."""
+    if replay.tick_rate != TICK_RATE:
+        raise ReplayError(f"replay recorded at {replay.tick_rate} Hz, simulation runs at {TICK_RATE} Hz")
+    if state is None:
+        state = replay.new_game()
+    for bits, n in replay.runs:
+        for _ in range(n):
+            step(state, bits, TICK_DT)
+    return state
+
+
+def verify(replay):
+    """Re-simulate and compare with the recorded result; returns (ok, final state)."""
+    state = play(replay)
+    return state.score == replay.score and state.level == replay.level, state
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="Inspect and verify Catch the Fruit replays")
+    parser.add_argument("command", choices=("info", "verify"))
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.files:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ReplayError) as e:
+            print(f"{path}: {e}")
+            failed += 1
+            continue
+        seconds = replay.ticks / replay.tick_rate
+        if args.command == "info":
+            print(f"{path}: seed {replay.seed} storm {replay.storm} ticks {replay.ticks} ({seconds:.1f}s) "
+                  f"score {replay.score} level {replay.level} runs {len(replay.runs)}")
+            continue
+        t0 = perf_counter()
+        ok, state = verify(replay)
+        elapsed = perf_counter() - t0
+        print(f"{path}: {'OK' if ok else 'MISMATCH'} score {state.score}/{replay.score} "
+              f"level {state.level}/{replay.level}, {seconds:.1f}s of play in {elapsed:.3f}s "
+              f"(x{seconds / max(elapsed, 1e-9):.0f} real-time)")
+        failed += not ok
+    sys.exit(1 if failed else 0)
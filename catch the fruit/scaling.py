@@ -0,0 +1,110 @@
+import os
+
+import pygame
+
+# -------------------------
+# Logical-resolution display
+# -------------------------
+# The game always draws a 480x720 frame. How that frame reaches a bigger screen:
+#
+#   native    a 480x720 window, no scaling
+#   hardware  pygame.SCALED: SDL's renderer stretches the frame on the GPU, so a 4K
+#             cabinet costs the same per-frame work as the native window
+#   software  the frame is drawn into an offscreen surface and upscaled with one
+#             transform.scale / smoothscale into the real window (no GPU renderer needed)
+#
+# The filter is "integer" (nearest neighbour, whole-pixel multiples, letterboxed) or
+# "smooth" (bilinear, fills as much of the screen as the aspect ratio allows).
+# pygame's SCALED renderer only keeps whole-pixel multiples in a window; fullscreen
+# hardware scaling always fills the screen.
+
+SCALE_MODES = ("native", "hardware", "software")
+SCALE_FILTERS = ("integer", "smooth")
+WINDOW_FILL = 0.9   # share of the desktop a scaled window may cover
+
+
+def scale_factor(logical, target, integer):
+    """Largest factor that fits logical inside target (whole numbers only if integer, at least 1)."""
+    factor = min(target[0] / logical[0], target[1] / logical[1])
+    if integer:
+        factor = int(factor)
+    return max(1, factor)
+
+
+def fit_rect(logical, target, integer):
+    """Rect (in target coordinates) the scaled frame covers, centred."""
+    factor = scale_factor(logical, target, integer)
+    w, h = int(logical[0] * factor), int(logical[1] * factor)
+    return pygame.Rect((target[0] - w) // 2, (target[1] - h) // 2, w, h)
+
+
+def _window_size(logical, integer):
+    desktop = pygame.display.get_desktop_sizes()[0]
+    room = (int(desktop[0] * WINDOW_FILL), int(desktop[1] * WINDOW_FILL))
+    return fit_rect(logical, room, integer).size
+
+
+class SoftwarePresenter:
+    """Draw target plus flip()/update() that upscale it into the real window."""
+
+    def __init__(self, window, logical, integer):
+        self.window = window
+        self.integer = integer
+        self.surface = pygame.Surface(logical).convert(window)
+        self.area = fit_rect(logical, window.get_size(), integer)
+        self.factor = self.area.w // logical[0]
+        self.dest = window.subsurface(self.area)
+        window.fill((0, 0, 0))
+        pygame.display.flip()
+
+    def flip(self):
+        if self.integer:
+            pygame.transform.scale(self.surface, self.area.size, self.dest)
+        else:
+            pygame.transform.smoothscale(self.surface, self.area.size, self.dest)
+        pygame.display.update(self.area)
+
+    def update(self, rects):
+        if not self.integer:
+            # bilinear filtering bleeds across rect edges, so rescale the whole frame
+            self.flip()
+            return
+        # nearest-neighbour scaling maps each logical rect onto an exact block of pixels
+        k = self.factor
+        out = []
+        clip = self.surface.get_rect()
+        for rect in rects:
+            rect = rect.clip(clip)
+            if not rect:
+                continue
+            big = pygame.Rect(rect.x * k, rect.y * k, rect.w * k, rect.h * k)
+            pygame.transform.scale(self.surface.subsurface(rect), big.size, self.dest.subsurface(big))
+            out.append(big.move(self.area.topleft))
+        pygame.display.update(out)
+
+
+def open_display(logical, scale="native", scale_filter="integer", vsync=False, fullscreen=False):
+    """Open the window; returns (surface to draw the logical frame on, presenter).
+
+    The presenter has flip() and update(rects) like pygame.display, which is what it is
+    unless the software path is used. Raises pygame.error if vsync is refused.
+    """
+    integer = scale_filter == "integer"
+    if scale == "software":
+        if fullscreen:
+            window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            window = pygame.display.set_mode(_window_size(logical, integer))
+        presenter = SoftwarePresenter(window, logical, integer)
+        return presenter.surface, presenter
+
+    flags = pygame.FULLSCREEN if fullscreen and scale == "hardware" else 0
+    if scale == "hardware" or vsync:
+        # SDL reads the filter when the SCALED renderer is created
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "nearest" if integer or scale != "hardware" else "linear"
+        flags |= pygame.SCALED
+    if vsync:
+        screen = pygame.display.set_mode(logical, flags, vsync=1)
+    else:
+        screen = pygame.display.set_mode(logical, flags)
+    return screen, pygame.display
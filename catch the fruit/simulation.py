@@ -0,0 +1,506 @@
+import random
+from math import sin
+
+from entities import Fruit, Mystery, Laser, Pop, Flash, Player, Pool, fruit_kinds
+from scheduler import Scheduler
+from swept import swept_hit
+from palette import NEON_PINK, NEON_BLUE, NEON_GREEN, NEON_YELLOW, NEON_ORANGE, RED, GRAY, PURPLE
+
+# -------------------------
+# Playfield and rules
+# -------------------------
+# Everything here is plain Python: no pygame, no display. The renderer in
+# catchthefallingfruit.py reads a GameState; bots, tests and balancing tools drive
+# step() directly.
+WIDTH, HEIGHT = 480, 720
+
+# Timers (milliseconds)
+LASER_INTERVAL = 8000      # spawn laser every 8s
+LASER_DURATION = 1200      # laser active for 1.2s
+MYSTERY_INTERVAL = 12000   # spawn mystery orb every 12s
+SUPER_DURATION = 4000      # super mode lasts 4s
+FREEZE_DURATION = 2000     # freeze time bonus duration
+SCORE_POP_LIFETIME = 700   # ms
+SLOW_DURATION = 3500       # slow-fruit effect
+REVERSE_DURATION = 5000    # reversed controls
+RESIZE_DURATION = 6000     # shrink / grow paddle
+COMBO_RESET_MS = 1800
+HUD_FLASH_MS = 300         # HUD glow colour override
+
+POWER_PER_CATCH = 12.0     # percent points
+LEVEL_SPEEDUP = 0.45       # added to every fruit type's speed per level
+
+# Fruit storm event: many simultaneous fruits in array storage (needs NumPy)
+STORM_FILL_TICKS = 60      # refill an empty storm over about a second
+STORM_GRID_MIN = 7000      # storms this large test only the fruits a grid finds near the paddle
+
+# Fruit types (shape-based)
+FRUIT_TYPES = [
+    {"color": NEON_PINK, "points": 1, "speed": 4.2, "size": 18},    # small apple
+    {"color": NEON_YELLOW, "points": 2, "speed": 5.0, "size": 24},  # banana-like
+    {"color": NEON_ORANGE, "points": 3, "speed": 6.0, "size": 28},  # orange-ish
+    {"color": NEON_BLUE, "points": 5, "speed": 4.8, "size": 22, "power": "slow"},  # slow-power
+    {"color": GRAY, "points": -1, "speed": 5.0, "size": 20, "power": "bomb"}       # bomb hazard
+]
+
+MYSTERY_EFFECTS = ["double_points", "reverse", "shrink", "grow", "freeze", "bonus_points"]
+
+# Fixed simulation rate: step() is always called with dt = TICK_DT, whatever the
+# render rate, so per-tick quantities (speeds, wobble, friction) are real-time stable.
+TICK_RATE = 60
+TICK_DT = 1.0 / TICK_RATE
+
+# Per-tick input bits
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_SPACE = 4   # SPACE pressed since the previous tick
+
+# -------------------------
+# Helpers
+# -------------------------
+def clamp(v, a, b):
+    return max(a, min(b, v))
+
+def boxes_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Same test as pygame.Rect.colliderect (positive sizes, half-open edges)."""
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+# -------------------------
+# Spawn helpers
+# -------------------------
+def spawn_fruit(rng, width, fruit_types, pool=None):
+    kind = rng.choice(fruit_types)
+    return (pool.acquire() if pool else Fruit()).reset(rng, width, kind)
+
+def spawn_mystery(rng, width, pool=None):
+    return (pool.acquire() if pool else Mystery()).reset(rng, width)
+
+def spawn_laser(rng, now, pool=None):
+    # Horizontal laser beam spans width at random Y; short lifetime
+    return (pool.acquire() if pool else Laser()).reset(rng.randint(140, HEIGHT - 200), now)
+
+# -------------------------
+# Game state
+# -------------------------
+class GameState:
+    """Everything one run of the game needs; time is the game's own clock in ms.
+
+    storm > 0 switches to fruit storm mode: up to that many fruits fall at once from a
+    FruitStore, and a missed fruit only breaks the combo instead of costing a life.
+    """
+
+    def __init__(self, rng=None, storm=0):
+        self.rng = rng if rng is not None else random.Random()
+        self.time_ms = 0.0
+        self.tick = 0
+
+        # Player state (rect paddle)
+        self.player = Player(WIDTH // 2 - 30, HEIGHT - 90)
+
+        # Recycled entities (see entities.py)
+        self.fruit_pool = Pool(Fruit)
+        self.mystery_pool = Pool(Mystery)
+        self.laser_pool = Pool(Laser)
+        self.pop_pool = Pool(Pop)
+        self.flash_pool = Pool(Flash)
+
+        # Per-run copy: level scaling mutates the speeds
+        self.fruit_types = fruit_kinds(FRUIT_TYPES)
+        self.fruit = spawn_fruit(self.rng, WIDTH, self.fruit_types, self.fruit_pool)
+        self.storm = None
+        self.storm_size = storm
+        if storm:
+            from broadphase import GridBroadphase
+            from fruit_store import FruitStore
+            self.storm = FruitStore(storm, seed=self.rng.getrandbits(64))
+            self.storm_grid = GridBroadphase(WIDTH, HEIGHT)
+
+        # Timed rules (see scheduler.py): spawners and the paddle size run at the start
+        # of a tick, effect expiry after its collisions, as the checks they replace did
+        self.timers = Scheduler()
+        self.effects = Scheduler()
+
+        self.mystery = None
+        self.laser = None
+        self.timers.after("laser", 0, LASER_INTERVAL, laser_due, order=1)
+        self.timers.after("mystery", 0, MYSTERY_INTERVAL, mystery_due, order=3)
+
+        self.score = 0
+        self.lives = 3
+        self.level = 1
+        self.slow_mode = False
+
+        # Combo system (reset on a miss or COMBO_RESET_MS after the last catch)
+        self.combo = 0
+
+        # Power bar (fills when catching fruits). When full, SPACE starts super mode.
+        self.power_bar = 0.0
+        self.super_active = False
+
+        # Mystery effect states
+        self.reverse_controls = False
+        self.freeze_time = False
+        self.freeze_until = 0
+
+        self.pops = []         # Pop entities
+        self.hud_flash = None  # Flash entity while the HUD glow is overridden
+        self.events = []       # (kind, x, y, color) for effects; cleared at the start of every tick
+        self.over = False
+
+    def flash(self, color):
+        self.flash_pool.release(self.hud_flash)
+        self.hud_flash = self.flash_pool.acquire().reset(color)
+        self.effects.after("hud_flash", self.time_ms, HUD_FLASH_MS, end_flash)
+
+    def pop(self, x, y, text):
+        self.pops.append(self.pop_pool.acquire().reset(x, y, text, self.time_ms))
+
+
+def apply_mystery_effect(state, effect):
+    """Apply a mystery orb effect to the state."""
+    player = state.player
+    now = state.time_ms
+    if effect == "double_points":
+        # temporarily double next point value via marking a pop
+        state.flash(NEON_YELLOW)
+        state.pop(WIDTH/2, HEIGHT/2, "DOUBLE!")
+        # Simpler: increase score immediately (bonus)
+        state.score += 5
+    elif effect == "reverse":
+        state.reverse_controls = True
+        state.effects.after("reverse", now + REVERSE_DURATION, 0, end_reverse)
+        state.flash(PURPLE)
+        state.pop(WIDTH/2, HEIGHT/2, "REVERSE!")
+    elif effect == "shrink":
+        # shrink player for challenge, restore after 6s
+        player.w = int(player.base_w * 0.6)
+        player.h = int(player.base_h * 0.6)
+        state.pop(WIDTH/2, HEIGHT/2, "SHRINK!")
+        # one "resize" timer: a later shrink or grow takes over the restore
+        state.timers.at("resize", now + RESIZE_DURATION, restore_size)
+    elif effect == "grow":
+        player.w = int(player.base_w * 1.25)
+        player.h = int(player.base_h * 1.25)
+        state.pop(WIDTH/2, HEIGHT/2, "GROW!")
+        state.timers.at("resize", now + RESIZE_DURATION, restore_size)
+    elif effect == "freeze":
+        state.freeze_time = True
+        state.freeze_until = now + FREEZE_DURATION
+        state.effects.after("freeze", state.freeze_until, 0, end_freeze)
+        state.pop(WIDTH/2, HEIGHT/2, "FREEZE!")
+        state.flash(NEON_BLUE)
+    elif effect == "bonus_points":
+        bonus = state.rng.randint(3, 8)
+        state.score += bonus
+        state.pop(WIDTH/2, HEIGHT/2, f"+{bonus}")
+        state.flash(NEON_YELLOW)
+
+# -------------------------
+# Simulation step
+# -------------------------
+def step(state, inputs, dt):
+    """Advance the game by one tick of dt seconds given the INPUT_* bits held this tick."""
+    if state.over:
+        return
+    integrate(state, inputs, dt)
+    resolve(state, dt)
+
+
+def integrate(state, inputs, dt):
+    """First half of a tick: clock, timers, spawns, input and movement."""
+    state.tick += 1
+    state.time_ms += dt * 1000.0
+    if state.events:
+        state.events = []
+    now = state.time_ms
+    player = state.player
+
+    # Paddle size restore, laser and mystery orb spawns, laser expiry
+    state.timers.run(now, state)
+
+    # Activate super if bar full
+    if inputs & INPUT_SPACE and state.power_bar >= 100 and not state.super_active:
+        state.super_active = True
+        state.effects.after("super", now, SUPER_DURATION, end_super)
+        state.power_bar = 0.0
+        state.flash(NEON_YELLOW)
+
+    # Movement input (account for reverse_controls)
+    player.prev_x = player.x
+    left_pressed = inputs & INPUT_LEFT
+    right_pressed = inputs & INPUT_RIGHT
+    if state.reverse_controls:
+        left_pressed, right_pressed = right_pressed, left_pressed
+
+    if left_pressed:
+        player.vel -= player.accel
+    elif right_pressed:
+        player.vel += player.accel
+    else:
+        player.vel *= player.friction
+
+    # clamp velocity
+    player.vel = clamp(player.vel, -player.max_speed, player.max_speed)
+    player.x += player.vel
+    # bounds
+    if player.x < 6:
+        player.x = 6
+        player.vel = 0
+    if player.x > WIDTH - player.w - 6:
+        player.x = WIDTH - player.w - 6
+        player.vel = 0
+
+    # Freeze time effect stops fruit/laser/mystery movement
+    time_frozen = state.freeze_time and now < state.freeze_until
+
+    fruit = state.fruit
+    mystery = state.mystery
+    fruit.prev_x, fruit.prev_y = fruit.x, fruit.y
+    if mystery:
+        mystery.prev_x, mystery.prev_y = mystery.x, mystery.y
+
+    # Fruit physics
+    if state.storm is not None and time_frozen:
+        state.storm.hold()
+    if not time_frozen:
+        speed_mod = 0.55 if state.slow_mode else 1.0
+        if state.storm is not None:
+            state.storm.update(speed_mod)
+        else:
+            fruit.wobble += 0.06
+            fruit.x += sin(fruit.wobble) * 0.6
+            fruit.y += fruit.speed * speed_mod
+
+    # Mystery physics
+    if mystery and not time_frozen:
+        mystery.wobble += 0.06
+        mystery.x += sin(mystery.wobble) * 0.6
+        mystery.y += mystery.speed
+
+
+def resolve(state, dt):
+    """Second half of a tick: collisions, scoring, effect expiry and the end condition."""
+    now = state.time_ms
+    player = state.player
+    fruit = state.fruit
+    mystery = state.mystery
+    time_frozen = state.freeze_time and now < state.freeze_until
+    paddle_x0 = player.prev_x
+    fruit_prev = (fruit.prev_x, fruit.prev_y)
+    px, py, pw, ph = int(player.x), int(player.y), player.w, player.h
+
+    # Laser collision check (thick horizontal beam; touching it costs a life)
+    if state.laser and not time_frozen:
+        if boxes_overlap(px, py, pw, ph, 0, state.laser.y - 8, WIDTH, 16):
+            state.lives -= 1
+            state.flash(RED)
+            state.events.append(("laser", px + pw / 2, state.laser.y, RED))
+            # remove laser to avoid multiple hits
+            state.timers.cancel("laser_end")
+            state.laser_pool.release(state.laser)
+            state.laser = None
+
+    # Collision detection with fruit: overlap now, or swept over the tick so fast
+    # fruit cannot pass through the paddle between two ticks
+    if state.storm is not None:
+        step_storm(state, paddle_x0, px, py, pw, ph)
+    else:
+        size = fruit.size
+        if (boxes_overlap(px, py, pw, ph, int(fruit.x - size), int(fruit.y - size), size * 2, size * 2)
+                or swept_hit(fruit_prev, (fruit.x, fruit.y), size, paddle_x0, player.x, py, pw, ph)):
+            catch_fruit(state, fruit.power, fruit.points, fruit.x, fruit.y, fruit.color)
+            # Respawn fruit (the caught one is recycled)
+            state.fruit_pool.release(fruit)
+            fruit = state.fruit = spawn_fruit(state.rng, WIDTH, state.fruit_types, state.fruit_pool)
+
+    # If fruit missed (falls beyond bottom)
+    if state.storm is None and fruit.y > HEIGHT + fruit.size:
+        state.lives -= 1
+        state.flash(RED)
+        state.fruit_pool.release(fruit)
+        state.fruit = spawn_fruit(state.rng, WIDTH, state.fruit_types, state.fruit_pool)
+        # reset combo on miss
+        state.combo = 0
+        state.effects.cancel("combo")
+
+    # Mystery collision
+    if mystery:
+        msize = mystery.size
+        if (boxes_overlap(px, py, pw, ph, int(mystery.x - msize), int(mystery.y - msize), msize * 2, msize * 2)
+                or swept_hit((mystery.prev_x, mystery.prev_y), (mystery.x, mystery.y), msize, paddle_x0, player.x, py, pw, ph)):
+            apply_mystery_effect(state, state.rng.choice(MYSTERY_EFFECTS))
+            state.mystery_pool.release(mystery)
+            state.mystery = None
+        # if missed -> disappear
+        elif mystery.y > HEIGHT + msize:
+            state.mystery_pool.release(mystery)
+            state.mystery = None
+
+    # Effect expiry (super, slow, reverse, freeze, combo timeout, HUD flash)
+    state.effects.run(now, state)
+
+    # Score pop animations: fade & rise
+    pops = state.pops
+    if pops:
+        if now - pops[0].start > SCORE_POP_LIFETIME:
+            # pops are in start order, so the expired ones are a prefix
+            expired = 0
+            while expired < len(pops) and now - pops[expired].start > SCORE_POP_LIFETIME:
+                state.pop_pool.release(pops[expired])
+                expired += 1
+            del pops[:expired]
+        for p in pops:
+            p.y -= 30 * dt  # float upward
+
+    # End condition
+    if state.lives <= 0:
+        state.over = True
+
+
+def catch_fruit(state, power, points, x, y, color=NEON_GREEN):
+    """Score a caught fruit (or apply its power) and scale the level."""
+    now = state.time_ms
+    state.events.append(("bomb" if power == "bomb" else "catch", x, y, color))
+    if power == "slow":
+        state.slow_mode = True
+        state.effects.after("slow", now, SLOW_DURATION, end_slow)
+        state.flash(NEON_BLUE)
+    elif power == "bomb":
+        # bomb subtracts a life
+        state.lives -= 1
+        state.flash(RED)
+    else:
+        # normal fruit: calculate points with combo and super
+        base_points = points
+        state.combo += 1
+        state.effects.after("combo", now, COMBO_RESET_MS, end_combo)
+        # +0.5 multiplier every 5 chain
+        multiplier = 1 + (state.combo // 5) * 0.5
+        if state.super_active:
+            multiplier *= 2.0
+        pts = int(base_points * multiplier)
+        state.score += pts
+        state.pop(x, y - 6, f"+{pts}")
+        state.flash(NEON_GREEN)
+        state.power_bar = clamp(state.power_bar + POWER_PER_CATCH, 0.0, 100.0)
+
+    # Level scaling every 10 points
+    new_level = state.score // 10 + 1
+    if new_level > state.level:
+        state.level = new_level
+        for ft in state.fruit_types:
+            ft.speed += LEVEL_SPEEDUP
+
+
+STORM_POWERS = (None, "slow", "bomb")   # FruitStore power codes -> names
+
+def step_storm(state, paddle_x0, px, py, pw, ph):
+    """Catch, miss and refill for fruit storm mode (physics already ran in step)."""
+    store = state.storm
+    # below STORM_GRID_MIN building the grid costs more than the whole-array test it saves
+    grid = state.storm_grid if store.count >= STORM_GRID_MIN else None
+    caught = store.caught(px, py, pw, ph, paddle_x0, state.player.x, grid)
+    if caught.any():
+        for i in caught.nonzero()[0]:
+            catch_fruit(state, STORM_POWERS[store.power[i]], int(store.points[i]),
+                        float(store.x[i]), float(store.y[i]), state.fruit_types[store.kind[i]].color)
+    missed = store.missed(HEIGHT) & ~caught
+    if missed.any():
+        # reset combo on miss; lives are only lost to bombs and lasers in a storm
+        state.combo = 0
+        state.effects.cancel("combo")
+    store.despawn(caught | missed)
+    deficit = state.storm_size - store.count
+    if deficit > 0:
+        store.spawn(min(deficit, max(1, state.storm_size // STORM_FILL_TICKS)), WIDTH, state.fruit_types)
+
+
+# -------------------------
+# Timer actions (called by state.timers / state.effects as action(state, now))
+# -------------------------
+def laser_due(state, now):
+    if state.laser:
+        # still on screen: try again next tick
+        state.timers.after("laser", now, 0, laser_due, order=1)
+        return
+    state.laser = spawn_laser(state.rng, now, state.laser_pool)
+    state.timers.after("laser", now, LASER_INTERVAL, laser_due, order=1)
+    state.timers.after("laser_end", now, LASER_DURATION, end_laser, order=2)
+
+def end_laser(state, now):
+    state.laser_pool.release(state.laser)
+    state.laser = None
+
+def mystery_due(state, now):
+    if state.mystery:
+        state.timers.after("mystery", now, 0, mystery_due, order=3)
+        return
+    state.mystery = spawn_mystery(state.rng, WIDTH, state.mystery_pool)
+    state.timers.after("mystery", now, MYSTERY_INTERVAL, mystery_due, order=3)
+
+def restore_size(state, now):
+    state.player.w = state.player.base_w
+    state.player.h = state.player.base_h
+
+def end_super(state, now):
+    state.super_active = False
+
+def end_slow(state, now):
+    state.slow_mode = False
+
+def end_reverse(state, now):
+    state.reverse_controls = False
+
+def end_freeze(state, now):
+    state.freeze_time = False
+
+def end_combo(state, now):
+    state.combo = 0
+
+def end_flash(state, now):
+    state.flash_pool.release(state.hud_flash)
+    state.hud_flash = None
+
+# -------------------------
+# Headless driver
+# -------------------------
+def chase_policy(state):
+    """Simple bot: steer the paddle centre under the fruit, away from bombs."""
+    player = state.player
+    fruit = state.fruit
+    centre = player.x + player.w / 2
+    target = fruit.x
+    if fruit.power == "bomb":
+        target = WIDTH - fruit.x
+    inputs = INPUT_SPACE if state.power_bar >= 100 else 0
+    if target < centre - 6:
+        inputs |= INPUT_LEFT
+    elif target > centre + 6:
+        inputs |= INPUT_RIGHT
+    if state.reverse_controls and inputs & (INPUT_LEFT | INPUT_RIGHT):
+        inputs ^= INPUT_LEFT | INPUT_RIGHT
+    return inputs
+
+
+def run_headless(policy, seed=None, max_ticks=TICK_RATE * 60 * 10, dt=TICK_DT):
+    """Play one game to completion (or max_ticks) without a display; returns the final state."""
+    state = GameState(random.Random(seed))
+    while not state.over and state.tick < max_ticks:
+        step(state, policy(state), dt)
+    return state
+
+
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    t0 = perf_counter()
+    ticks = 0
+    scores = []
+    for seed in range(games):
+        s = run_headless(chase_policy, seed)
+        ticks += s.tick
+        scores.append(s.score)
+    elapsed = perf_counter() - t0
+    print(f"{games} games, {ticks} ticks in {elapsed:.2f}s -> {ticks / elapsed:,.0f} ticks/s; "
+          f"mean score {sum(scores) / len(scores):.1f}")
@@ -0,0 +1,65 @@
+# -------------------------
+# Continuous (swept) box collision
+# -------------------------
+# The per-tick overlap test only looks at where things ended up. Once a fruit falls
+# farther in one tick than the paddle is tall (44 px, less when shrunk), it can start
+# above the paddle and finish below it without ever overlapping on a sampled tick.
+# Sweeping both boxes over the tick catches those hits at any speed.
+
+def sweep_boxes(ax0, ay0, ax1, ay1, aw, ah, bx0, by0, bx1, by1, bw, bh):
+    """First time t in [0, 1] at which moving box A overlaps moving box B, else None.
+
+    Boxes are (top-left, size); A moves (ax0, ay0) -> (ax1, ay1) and B moves
+    (bx0, by0) -> (bx1, by1) linearly over the tick. Edges touching is not a hit,
+    matching Rect.colliderect.
+    """
+    # Work in B's frame: A's offset from B goes from p to p + d*t and has to sit
+    # strictly inside (-a_size, b_size) on both axes at the same time.
+    t0, t1 = 0.0, 1.0
+    for p, d, lo, hi in ((ax0 - bx0, (ax1 - ax0) - (bx1 - bx0), -aw, bw),
+                         (ay0 - by0, (ay1 - ay0) - (by1 - by0), -ah, bh)):
+        if d == 0:
+            if not lo < p < hi:
+                return None
+            continue
+        ta = (lo - p) / d
+        tb = (hi - p) / d
+        if ta > tb:
+            ta, tb = tb, ta
+        if ta > t0:
+            t0 = ta
+        if tb < t1:
+            t1 = tb
+        if t0 >= t1:
+            return None
+    return t0
+
+
+def swept_hit(prev, cur, size, paddle_x0, paddle_x1, paddle_y, paddle_w, paddle_h):
+    """Swept test of a falling item (centre prev -> cur, half-extent size) against the paddle."""
+    # Cheap reject: the item's vertical span over the whole tick misses the paddle's rows
+    if max(prev[1], cur[1]) + size <= paddle_y or min(prev[1], cur[1]) - size >= paddle_y + paddle_h:
+        return False
+    return sweep_boxes(prev[0] - size, prev[1] - size, cur[0] - size, cur[1] - size, size * 2, size * 2,
+                       paddle_x0, paddle_y, paddle_x1, paddle_y, paddle_w, paddle_h) is not None
+
+
+if __name__ == "__main__":
+    # A fruit (size 18) dropped straight onto the paddle from every sub-tick phase:
+    # how many of those drops does each test register as a catch?
+    paddle_x, paddle_y, w, h = 210, 630, 60, 44
+    size = 18
+    for speed in (10, 40, 80, 120, 200):
+        sampled = swept = 0
+        for phase in range(speed):
+            y = 400.0 + phase
+            hit_sampled = hit_swept = False
+            while y < 760:
+                ny = y + speed
+                top = int(ny - size)
+                hit_sampled |= top < paddle_y + h and paddle_y < top + size * 2
+                hit_swept |= swept_hit((240, y), (240, ny), size, paddle_x, paddle_x, paddle_y, w, h)
+                y = ny
+            sampled += hit_sampled
+            swept += hit_swept
+        print(f"speed {speed:4d} px/tick: per-tick overlap {sampled}/{speed}, swept {swept}/{speed}")
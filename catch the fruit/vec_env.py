@@ -0,0 +1,421 @@
+import numpy as np
+
+from simulation import (WIDTH, HEIGHT, TICK_DT, FRUIT_TYPES, MYSTERY_EFFECTS, LASER_INTERVAL, LASER_DURATION,
+                        MYSTERY_INTERVAL, SUPER_DURATION, FREEZE_DURATION, SLOW_DURATION, REVERSE_DURATION,
+                        RESIZE_DURATION, COMBO_RESET_MS, POWER_PER_CATCH, LEVEL_SPEEDUP,
+                        INPUT_LEFT, INPUT_RIGHT, INPUT_SPACE)
+
+# -------------------------
+# Vectorized environment
+# -------------------------
+# N independent games advanced together, one NumPy operation per rule over all of them.
+# The rules are those of simulation.step (paddle acceleration and friction, the fruit
+# types and their powers, combo multiplier, power bar and super, lasers, mystery
+# effects, lives, level speed-ups, swept catches) with the same constants. Each game
+# draws from its own slice of one NumPy generator, so a run is reproducible from its
+# seed but does not follow the random stream of a GameState with the same seed.
+# Cosmetic state (score pops, HUD flashes) is not simulated.
+#
+#   env = VecCatchEnv(1024, seed=0)
+#   obs = env.reset()
+#   obs, reward, done, info = env.step(actions)   # actions: INPUT_* bits per game
+#
+# Finished games are reset automatically; info["final_score"] etc. hold their results.
+
+PLAYER_Y = HEIGHT - 90
+BASE_W, BASE_H = 60, 44
+SHRUNK = (int(BASE_W * 0.6), int(BASE_H * 0.6))
+GROWN = (int(BASE_W * 1.25), int(BASE_H * 1.25))
+ACCEL, FRICTION, MAX_SPEED = 0.7, 0.86, 9.0
+MYSTERY_SIZE, MYSTERY_SPEED = 18, 3.5
+WOBBLE_STEP, WOBBLE_DRIFT = 0.06, 0.6
+SLOW_FACTOR = 0.55
+START_LIVES = 3
+
+# Per-type columns, indexed by fruit kind
+TYPE_SPEED = np.array([f["speed"] for f in FRUIT_TYPES])
+TYPE_SIZE = np.array([f["size"] for f in FRUIT_TYPES])
+TYPE_POINTS = np.array([f["points"] for f in FRUIT_TYPES])
+TYPE_SLOW = np.array([f.get("power") == "slow" for f in FRUIT_TYPES])
+TYPE_BOMB = np.array([f.get("power") == "bomb" for f in FRUIT_TYPES])
+TYPE_NORMAL = ~(TYPE_SLOW | TYPE_BOMB)
+
+(EFFECT_DOUBLE, EFFECT_REVERSE, EFFECT_SHRINK,
+ EFFECT_GROW, EFFECT_FREEZE, EFFECT_BONUS) = (MYSTERY_EFFECTS.index(e) for e in (
+    "double_points", "reverse", "shrink", "grow", "freeze", "bonus_points"))
+
+# Feature vector returned by reset()/step(), one float32 row per game, roughly in [0, 1]
+OBS_FIELDS = ("paddle_x", "paddle_vel", "paddle_w", "fruit_x", "fruit_y", "fruit_speed",
+              "fruit_slow", "fruit_bomb", "mystery", "mystery_x", "mystery_y", "laser", "laser_y",
+              "power_bar", "super", "slow", "reverse", "frozen", "lives", "combo")
+
+# Pixel observation: a small grayscale frame per game
+FRAME_SIZE = (48, 72)   # (width, height), 1/10 of the playfield
+PIXEL_PADDLE, PIXEL_FRUIT, PIXEL_BOMB, PIXEL_MYSTERY, PIXEL_LASER = 255, 170, 80, 220, 120
+
+
+def swept_mask(ax0, ay0, ax1, ay1, aw, ah, bx0, by0, bx1, by1, bw, bh):
+    """Vectorized swept.sweep_boxes: True where moving box A touches moving box B during the tick."""
+    ok = True
+    t0 = 0.0
+    t1 = 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, d, lo, hi in ((ax0 - bx0, (ax1 - ax0) - (bx1 - bx0), -aw, bw),
+                             (ay0 - by0, (ay1 - ay0) - (by1 - by0), -ah, bh)):
+            still = d == 0
+            ok = ok & (~still | ((lo < p) & (p < hi)))
+            ta = (lo - p) / d
+            tb = (hi - p) / d
+            t0 = np.maximum(t0, np.where(still, 0.0, np.minimum(ta, tb)))
+            t1 = np.minimum(t1, np.where(still, 1.0, np.maximum(ta, tb)))
+    return ok & (t0 < t1)
+
+
+def overlap_mask(ax, ay, aw, ah, bx, by, bw, bh):
+    """Vectorized boxes_overlap (colliderect semantics)."""
+    return (ax < bx + bw) & (bx < ax + aw) & (ay < by + bh) & (by < ay + ah)
+
+
+class VecCatchEnv:
+    """N games of Catch the Fruit as struct-of-arrays state with a batched step()."""
+
+    FLOAT_FIELDS = ("time_ms", "px", "prev_px", "vel", "fx", "fy", "prev_fx", "prev_fy", "fwobble",
+                    "speed_bonus", "fspeed", "mx", "my", "prev_mx", "prev_my", "mwobble", "last_mystery",
+                    "laser_y", "laser_start", "last_laser", "power_bar", "super_start", "slow_start",
+                    "combo_timer", "reverse_until", "freeze_until", "resize_until")
+    INT_FIELDS = ("tick", "pw", "ph", "kind", "score", "lives", "level", "combo")
+    BOOL_FIELDS = ("mystery", "laser", "super_active", "slow_mode", "reverse", "freeze")
+
+    def __init__(self, n, seed=None, pixels=False, max_ticks=None, dt=TICK_DT):
+        self.n = n
+        self.dt = dt
+        self.pixels = pixels
+        self.max_ticks = max_ticks
+        self.rng = np.random.default_rng(seed)
+        for name in self.FLOAT_FIELDS:
+            setattr(self, name, np.zeros(n))
+        for name in self.INT_FIELDS:
+            setattr(self, name, np.zeros(n, dtype=np.int64))
+        for name in self.BOOL_FIELDS:
+            setattr(self, name, np.zeros(n, dtype=bool))
+        self.obs = np.zeros((n, len(OBS_FIELDS)), dtype=np.float32)
+        self.frames = np.zeros((n, FRAME_SIZE[1], FRAME_SIZE[0]), dtype=np.uint8) if pixels else None
+        self._cols = np.arange(FRAME_SIZE[0]) * (WIDTH / FRAME_SIZE[0])
+        self._rows = np.arange(FRAME_SIZE[1]) * (HEIGHT / FRAME_SIZE[1])
+
+    # ----------------------
+    # Reset / spawn
+    # ----------------------
+    def reset(self, seed=None):
+        """Start every game afresh; returns the observation (and frames if pixels)."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset(np.ones(self.n, dtype=bool))
+        return self.observe()
+
+    def _reset(self, mask):
+        for name in self.FLOAT_FIELDS:
+            getattr(self, name)[mask] = 0.0
+        for name in self.INT_FIELDS:
+            getattr(self, name)[mask] = 0
+        for name in self.BOOL_FIELDS:
+            getattr(self, name)[mask] = False
+        self.px[mask] = self.prev_px[mask] = WIDTH // 2 - BASE_W // 2
+        self.pw[mask] = BASE_W
+        self.ph[mask] = BASE_H
+        self.lives[mask] = START_LIVES
+        self.level[mask] = 1
+        self.resize_until[mask] = np.inf
+        self._spawn_fruit(mask)
+
+    def _spawn_fruit(self, mask):
+        k = int(mask.sum())
+        if not k:
+            return
+        rng = self.rng
+        kind = rng.integers(0, len(FRUIT_TYPES), k)
+        self.kind[mask] = kind
+        self.fx[mask] = self.prev_fx[mask] = rng.integers(30, WIDTH - 30 + 1, k)
+        self.fy[mask] = self.prev_fy[mask] = -rng.integers(20, 160 + 1, k)
+        self.fwobble[mask] = rng.random(k) * 2 * np.pi
+        # a fruit keeps the speed its type had when it spawned
+        self.fspeed[mask] = TYPE_SPEED[kind] + self.speed_bonus[mask]
+
+    def _spawn_mystery(self, mask):
+        k = int(mask.sum())
+        if not k:
+            return
+        rng = self.rng
+        self.mystery[mask] = True
+        self.mx[mask] = self.prev_mx[mask] = rng.integers(40, WIDTH - 40 + 1, k)
+        self.my[mask] = self.prev_my[mask] = -rng.integers(30, 200 + 1, k)
+        self.mwobble[mask] = rng.random(k) * 2 * np.pi
+
+    # ----------------------
+    # Step
+    # ----------------------
+    def step(self, actions):
+        """Advance every game one tick; actions holds INPUT_* bits per game.
+
+        Returns (obs, reward, done, info): reward is the score gained this tick, done marks
+        games that ended (and were reset), info has their final score, level and ticks.
+        """
+        actions = np.asarray(actions)
+        rng = self.rng
+        before = self.score.copy()
+        self.tick += 1
+        self.time_ms += self.dt * 1000.0
+        now = self.time_ms
+
+        # Timed restore of the paddle size
+        m = now >= self.resize_until
+        self.resize_until[m] = np.inf
+        self.pw[m] = BASE_W
+        self.ph[m] = BASE_H
+
+        # Super
+        m = ((actions & INPUT_SPACE) != 0) & (self.power_bar >= 100) & ~self.super_active
+        self.super_active |= m
+        self.super_start[m] = now[m]
+        self.power_bar[m] = 0.0
+
+        # Lasers and mystery orbs
+        m = ~self.laser & (now - self.last_laser > LASER_INTERVAL)
+        if m.any():
+            self.laser |= m
+            self.laser_y[m] = rng.integers(140, HEIGHT - 200 + 1, int(m.sum()))
+            self.laser_start[m] = now[m]
+            self.last_laser[m] = now[m]
+        self.laser &= ~(now - self.laser_start > LASER_DURATION)
+        m = ~self.mystery & (now - self.last_mystery > MYSTERY_INTERVAL)
+        if m.any():
+            self._spawn_mystery(m)
+            self.last_mystery[m] = now[m]
+
+        # Paddle
+        self.prev_px[:] = self.px
+        left = (actions & INPUT_LEFT) != 0
+        right = (actions & INPUT_RIGHT) != 0
+        left, right = np.where(self.reverse, right, left), np.where(self.reverse, left, right)
+        vel = np.where(left, self.vel - ACCEL, np.where(right, self.vel + ACCEL, self.vel * FRICTION))
+        np.clip(vel, -MAX_SPEED, MAX_SPEED, out=vel)
+        px = self.px + vel
+        edge = (px < 6) | (px > WIDTH - self.pw - 6)
+        px = np.clip(px, 6, None)
+        px = np.where(px > WIDTH - self.pw - 6, WIDTH - self.pw - 6, px)
+        vel[edge] = 0.0
+        self.vel = vel
+        self.px = px
+
+        # Fruit and mystery physics (stopped while time is frozen)
+        frozen = self.freeze & (now < self.freeze_until)
+        moving = ~frozen
+        self.prev_fx[:] = self.fx
+        self.prev_fy[:] = self.fy
+        self.prev_mx[:] = self.mx
+        self.prev_my[:] = self.my
+        self.fwobble += np.where(moving, WOBBLE_STEP, 0.0)
+        self.fx += np.where(moving, np.sin(self.fwobble) * WOBBLE_DRIFT, 0.0)
+        self.fy += np.where(moving, self.fspeed * np.where(self.slow_mode, SLOW_FACTOR, 1.0), 0.0)
+        mm = moving & self.mystery
+        self.mwobble += np.where(mm, WOBBLE_STEP, 0.0)
+        self.mx += np.where(mm, np.sin(self.mwobble) * WOBBLE_DRIFT, 0.0)
+        self.my += np.where(mm, MYSTERY_SPEED, 0.0)
+
+        # Collisions use the paddle's integer rect, like the pygame version
+        pxi = px.astype(np.int64)
+        pw, ph = self.pw, self.ph
+
+        # Laser
+        m = self.laser & moving & overlap_mask(pxi, PLAYER_Y, pw, ph, 0, self.laser_y.astype(np.int64) - 8, WIDTH, 16)
+        self.lives -= m
+        self.laser &= ~m
+
+        # Fruit catch (overlap at the end of the tick, or swept over it)
+        size = TYPE_SIZE[self.kind]
+        caught = (overlap_mask(pxi, PLAYER_Y, pw, ph, (self.fx - size).astype(np.int64),
+                               (self.fy - size).astype(np.int64), size * 2, size * 2)
+                  | swept_mask(self.prev_fx - size, self.prev_fy - size, self.fx - size, self.fy - size,
+                               size * 2, size * 2, self.prev_px, PLAYER_Y, px, PLAYER_Y, pw, ph))
+        if caught.any():
+            self._catch(caught, now)
+            self._spawn_fruit(caught)
+
+        # Missed fruit
+        missed = self.fy > HEIGHT + TYPE_SIZE[self.kind]
+        if missed.any():
+            self.lives -= missed
+            self.combo[missed] = 0
+            self.combo_timer[missed] = 0.0
+            self._spawn_fruit(missed)
+
+        # Mystery orb
+        if self.mystery.any():
+            ms = MYSTERY_SIZE
+            hit = self.mystery & (
+                overlap_mask(pxi, PLAYER_Y, pw, ph, (self.mx - ms).astype(np.int64),
+                             (self.my - ms).astype(np.int64), ms * 2, ms * 2)
+                | swept_mask(self.prev_mx - ms, self.prev_my - ms, self.mx - ms, self.my - ms, ms * 2, ms * 2,
+                             self.prev_px, PLAYER_Y, px, PLAYER_Y, pw, ph))
+            if hit.any():
+                self._mystery_effect(hit, now)
+            self.mystery &= ~hit & ~(self.my > HEIGHT + ms)
+
+        # Effect expiry
+        self.super_active &= ~(now - self.super_start > SUPER_DURATION)
+        self.slow_mode &= ~(now - self.slow_start > SLOW_DURATION)
+        self.reverse &= ~(now > self.reverse_until)
+        self.freeze &= ~(now > self.freeze_until)
+        self.combo[(self.combo > 0) & (now - self.combo_timer > COMBO_RESET_MS)] = 0
+
+        reward = self.score - before
+        done = self.lives <= 0
+        if self.max_ticks is not None:
+            done |= self.tick >= self.max_ticks
+        info = {}
+        if done.any():
+            info = {"final_score": self.score[done].copy(), "final_level": self.level[done].copy(),
+                    "final_ticks": self.tick[done].copy()}
+            self._reset(done)
+        return self.observe(), reward, done, info
+
+    def _catch(self, caught, now):
+        powers = self.kind[caught]
+        slow = np.zeros(self.n, dtype=bool)
+        slow[caught] = TYPE_SLOW[powers]
+        self.slow_mode |= slow
+        self.slow_start[slow] = now[slow]
+        bomb = np.zeros(self.n, dtype=bool)
+        bomb[caught] = TYPE_BOMB[powers]
+        self.lives -= bomb
+        normal = caught & ~slow & ~bomb
+        if normal.any():
+            self.combo[normal] += 1
+            self.combo_timer[normal] = now[normal]
+            multiplier = 1 + (self.combo[normal] // 5) * 0.5
+            multiplier *= np.where(self.super_active[normal], 2.0, 1.0)
+            self.score[normal] += (TYPE_POINTS[self.kind[normal]] * multiplier).astype(np.int64)
+            self.power_bar[normal] = np.minimum(self.power_bar[normal] + POWER_PER_CATCH, 100.0)
+        # Level scaling every 10 points: one speed-up per level change, as in catch_fruit
+        new_level = self.score // 10 + 1
+        up = caught & (new_level > self.level)
+        self.level[up] = new_level[up]
+        self.speed_bonus[up] += LEVEL_SPEEDUP
+
+    def _mystery_effect(self, hit, now):
+        effect = np.full(self.n, -1)
+        effect[hit] = self.rng.integers(0, len(MYSTERY_EFFECTS), int(hit.sum()))
+        self.score += np.where(effect == EFFECT_DOUBLE, 5, 0)
+        m = effect == EFFECT_REVERSE
+        self.reverse |= m
+        self.reverse_until[m] = now[m] + REVERSE_DURATION
+        # one resize deadline, as simulation's "resize" timer: the latest shrink or grow
+        # sets pw/ph and takes over the restore
+        m = effect == EFFECT_SHRINK
+        self.pw[m], self.ph[m] = SHRUNK
+        self.resize_until[m] = now[m] + RESIZE_DURATION
+        m = effect == EFFECT_GROW
+        self.pw[m], self.ph[m] = GROWN
+        self.resize_until[m] = now[m] + RESIZE_DURATION
+        m = effect == EFFECT_FREEZE
+        self.freeze |= m
+        self.freeze_until[m] = now[m] + FREEZE_DURATION
+        m = effect == EFFECT_BONUS
+        if m.any():
+            self.score[m] += self.rng.integers(3, 8 + 1, int(m.sum()))
+
+    # ----------------------
+    # Observations
+    # ----------------------
+    def observe(self):
+        """Feature rows (see OBS_FIELDS); with pixels=True, (features, frames)."""
+        o = self.obs
+        o[:, 0] = self.px / WIDTH
+        o[:, 1] = self.vel / MAX_SPEED
+        o[:, 2] = self.pw / WIDTH
+        o[:, 3] = self.fx / WIDTH
+        o[:, 4] = self.fy / HEIGHT
+        o[:, 5] = self.fspeed / 10.0
+        o[:, 6] = TYPE_SLOW[self.kind]
+        o[:, 7] = TYPE_BOMB[self.kind]
+        o[:, 8] = self.mystery
+        o[:, 9] = np.where(self.mystery, self.mx / WIDTH, 0.0)
+        o[:, 10] = np.where(self.mystery, self.my / HEIGHT, 0.0)
+        o[:, 11] = self.laser
+        o[:, 12] = np.where(self.laser, self.laser_y / HEIGHT, 0.0)
+        o[:, 13] = self.power_bar / 100.0
+        o[:, 14] = self.super_active
+        o[:, 15] = self.slow_mode
+        o[:, 16] = self.reverse
+        o[:, 17] = self.freeze & (self.time_ms < self.freeze_until)
+        o[:, 18] = self.lives / START_LIVES
+        o[:, 19] = np.minimum(self.combo, 20) / 20.0
+        if self.pixels:
+            return o, self.render_frames()
+        return o
+
+    def render_frames(self):
+        """Draw every game into its FRAME_SIZE grayscale frame (boxes only)."""
+        frames = self.frames
+        frames[:] = 0
+        size = TYPE_SIZE[self.kind]
+        fruit_value = np.where(TYPE_BOMB[self.kind], PIXEL_BOMB, PIXEL_FRUIT).astype(np.uint8)
+        self._boxes(self.laser, 0, self.laser_y - 8, WIDTH, 16, PIXEL_LASER)
+        self._boxes(self.mystery, self.mx - MYSTERY_SIZE, self.my - MYSTERY_SIZE,
+                    2 * MYSTERY_SIZE, 2 * MYSTERY_SIZE, PIXEL_MYSTERY)
+        self._boxes(None, self.fx - size, self.fy - size, 2 * size, 2 * size, fruit_value)
+        self._boxes(None, self.px, PLAYER_Y, self.pw, self.ph, PIXEL_PADDLE)
+        return frames
+
+    def _boxes(self, live, x, y, w, h, value):
+        # a box covers the pixels whose top-left sample point lies inside it
+        cols = self._cols
+        rows = self._rows
+        x = np.broadcast_to(x, (self.n,))
+        y = np.broadcast_to(y, (self.n,))
+        col_in = (cols >= x[:, None]) & (cols < (x + w)[:, None])
+        row_in = (rows >= y[:, None]) & (rows < (y + h)[:, None])
+        if live is not None:
+            row_in &= live[:, None]
+        mask = row_in[:, :, None] & col_in[:, None, :]
+        if np.ndim(value):
+            value = np.broadcast_to(np.asarray(value)[:, None, None], mask.shape)
+            self.frames[mask] = value[mask]
+        else:
+            self.frames[mask] = value
+
+# -------------------------
+# Bot and benchmark
+# -------------------------
+def chase_actions(env):
+    """simulation.chase_policy for every game at once."""
+    centre = env.px + env.pw / 2
+    target = np.where(TYPE_BOMB[env.kind], WIDTH - env.fx, env.fx)
+    actions = np.where(env.power_bar >= 100, INPUT_SPACE, 0)
+    actions |= np.where(target < centre - 6, INPUT_LEFT, np.where(target > centre + 6, INPUT_RIGHT, 0))
+    steer = (actions & (INPUT_LEFT | INPUT_RIGHT)) != 0
+    actions ^= np.where(env.reverse & steer, INPUT_LEFT | INPUT_RIGHT, 0)
+    return actions
+
+
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    for pixels in (False, True):
+        env = VecCatchEnv(n, seed=0, pixels=pixels)
+        env.reset()
+        scores = []
+        t0 = perf_counter()
+        for _ in range(ticks):
+            _, _, done, info = env.step(chase_actions(env))
+            if done.any():
+                scores.extend(info["final_score"].tolist())
+        elapsed = perf_counter() - t0
+        label = "with pixel frames" if pixels else "features only"
+        mean = sum(scores) / len(scores) if scores else float("nan")
+        print(f"{n} games x {ticks} ticks ({label}): {n * ticks / elapsed:,.0f} game-steps/s; "
+              f"{len(scores)} games finished, mean score {mean:.1f}")
+        if not pixels:
+            ticks = max(1, ticks // 10)